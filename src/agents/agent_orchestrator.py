@@ -13,7 +13,7 @@ Features:
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 import uuid
@@ -46,15 +46,16 @@ class MaterialTrace:
     
     def add_journey_step(self, stage: str, agent_id: str, operation: str, details: Dict = None):
         """Add a step to the material's journey"""
+        now = datetime.now()
         step = {
-            "timestamp": datetime.now(),
+            "timestamp": now,
             "stage": stage,
             "agent_id": agent_id,
             "operation": operation,
             "details": details or {}
         }
         self.journey_log.append(step)
-        self.last_updated = datetime.now()
+        self.last_updated = now
         self.current_location = agent_id
 
 class SupplyChainOrchestrator:
@@ -87,8 +88,14 @@ class SupplyChainOrchestrator:
         self.material_traces: Dict[str, MaterialTrace] = {}
         self.active_shipments: Dict[str, Dict] = {}
         
-        # Operator request queue
+        # Operator request queue (in arrival order) and the same requests by request_id
         self.pending_operator_requests: List[Dict] = []
+        self._operator_requests_by_id: Dict[str, Dict] = {}
+        
+        # Operator request handlers by agent type
+        self._request_handlers: Dict[str, Callable[[Dict, Dict[str, Any]], Dict]] = {
+            "processing": self._process_processing_request
+        }
         
         logger.info("Supply Chain Orchestrator initialized")
     
@@ -247,6 +254,7 @@ class SupplyChainOrchestrator:
         }
         
         self.pending_operator_requests.append(operator_request)
+        self._operator_requests_by_id[operator_request["request_id"]] = operator_request
         logger.info(f"Created operator request for processing {material_type}")
     
     def process_operator_request(self, request_id: str, operator_inputs: Dict[str, Any]) -> Dict:
@@ -261,24 +269,17 @@ class SupplyChainOrchestrator:
             Result of the processing operation
         """
         # Find the request
-        request = None
-        for req in self.pending_operator_requests:
-            if req["request_id"] == request_id:
-                request = req
-                break
+        request = self._operator_requests_by_id.get(request_id)
         
         if not request:
             return {"error": "Request not found"}
         
         # Process based on agent type
-        if request["agent_type"] == "processing":
-            return self._process_processing_request(request, operator_inputs)
-        elif request["agent_type"] == "manufacturing":
-            return self._process_manufacturing_request(request, operator_inputs)
-        elif request["agent_type"] == "retail":
-            return self._process_retail_request(request, operator_inputs)
-        
-        return {"error": "Unknown agent type"}
+        handler = self._request_handlers.get(request["agent_type"])
+        if handler is None:
+            return {"error": "Unknown agent type"}
+        
+        return handler(request, operator_inputs)
     
     def _process_processing_request(self, request: Dict, operator_inputs: Dict[str, Any]) -> Dict:
         """Handle processing operation and auto-route to manufacturing"""
@@ -301,6 +302,7 @@ class SupplyChainOrchestrator:
             
         # Remove request from queue
         self.pending_operator_requests.remove(request)
+        del self._operator_requests_by_id[request["request_id"]]
         
         return result
     
@@ -17,15 +17,67 @@ mining-based manufacturing operations.
 """
 
 import logging
+from collections import Counter
 from base_agent import BaseSupplyChainAgent
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import random
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Scheduling inputs shared by every recipe (and every request, so each spec is read-only)
+_SCHEDULING_INPUTS = {
+    "production_priority": MappingProxyType({
+        "type": "choice",
+        "options": ("urgent", "normal", "batch_production"),
+        "description": "Production scheduling priority",
+        "default": "normal",
+        "required": True
+    }),
+    "quality_standard": MappingProxyType({
+        "type": "choice",
+        "options": ("standard", "premium", "industrial_grade"),
+        "description": "Quality standard for manufactured products",
+        "default": "standard",
+        "required": True
+    })
+}
+
+_QUALITY_CONTROL_INPUT = MappingProxyType({
+    "type": "choice",
+    "options": ("basic", "standard", "enhanced"),
+    "description": "Level of quality control testing to perform",
+    "default": "standard",
+    "required": True
+})
+
+# Extra inputs requested for fertilizer and steel recipes
+_NUTRIENT_BLEND_INPUT = MappingProxyType({
+    "type": "choice",
+    "options": ("standard_npk", "high_phosphorus", "balanced_mix"),
+    "description": "Fertilizer nutrient blend configuration",
+    "default": "standard_npk",
+    "required": True
+})
+
+_ALLOY_COMPOSITION_INPUT = MappingProxyType({
+    "type": "choice",
+    "options": ("carbon_steel", "stainless_steel", "alloy_steel"),
+    "description": "Steel alloy composition specification",
+    "default": "carbon_steel",
+    "required": True
+})
+
+# Production time and energy multipliers by quality standard
+_QUALITY_MULTIPLIERS = MappingProxyType({"standard": 1.0, "premium": 1.3, "industrial_grade": 0.8})
+
+# Base quality control success rates, and their adjustment by QC level
+_QC_BASE_RATES = MappingProxyType({"standard": 0.95, "premium": 0.90, "industrial_grade": 0.98})
+_QC_MULTIPLIERS = MappingProxyType({"basic": 0.95, "standard": 1.0, "enhanced": 1.05})
+
 class ManufacturingAgent(BaseSupplyChainAgent):
     """
     Manufacturing agent for Maadan model integration.
@@ -168,7 +220,9 @@ class ManufacturingAgent(BaseSupplyChainAgent):
             quantity: Planned production quantity
             
         Returns:
-            Dictionary of required operator inputs with descriptions
+            Dictionary of required operator inputs with descriptions. The dict
+            is new on every call; the fixed specs inside it are shared read-only
+            mappings, so copy a spec before changing it.
         """
         if recipe_name not in self.manufacturing_recipes:
             return {"error": f"No manufacturing recipe available for {recipe_name}"}
@@ -177,20 +231,7 @@ class ManufacturingAgent(BaseSupplyChainAgent):
         
         # Create input requirements based on the recipe
         required_inputs = {
-            "production_priority": {
-                "type": "choice",
-                "options": ["urgent", "normal", "batch_production"],
-                "description": "Production scheduling priority",
-                "default": "normal",
-                "required": True
-            },
-            "quality_standard": {
-                "type": "choice",
-                "options": ["standard", "premium", "industrial_grade"],
-                "description": "Quality standard for manufactured products",
-                "default": "standard",
-                "required": True
-            },
+            **_SCHEDULING_INPUTS,
             "batch_size": {
                 "type": "float",
                 "min": 1.0,
@@ -199,33 +240,15 @@ class ManufacturingAgent(BaseSupplyChainAgent):
                 "default": min(quantity, self.manufacturing_capacity * 0.7),
                 "required": True
             },
-            "quality_control_level": {
-                "type": "choice",
-                "options": ["basic", "standard", "enhanced"],
-                "description": "Level of quality control testing to perform",
-                "default": "standard",
-                "required": True
-            }
+            "quality_control_level": _QUALITY_CONTROL_INPUT
         }
         
         # Add recipe-specific inputs based on product type
         output_product = recipe.get("output_product", "")
         if "Fertilizer" in output_product:
-            required_inputs["nutrient_blend"] = {
-                "type": "choice",
-                "options": ["standard_npk", "high_phosphorus", "balanced_mix"],
-                "description": "Fertilizer nutrient blend configuration",
-                "default": "standard_npk",
-                "required": True
-            }
+            required_inputs["nutrient_blend"] = _NUTRIENT_BLEND_INPUT
         elif "Steel" in output_product:
-            required_inputs["alloy_composition"] = {
-                "type": "choice",
-                "options": ["carbon_steel", "stainless_steel", "alloy_steel"],
-                "description": "Steel alloy composition specification",
-                "default": "carbon_steel",
-                "required": True
-            }
+            required_inputs["alloy_composition"] = _ALLOY_COMPOSITION_INPUT
         
         return required_inputs
     
@@ -300,8 +323,7 @@ class ManufacturingAgent(BaseSupplyChainAgent):
         actual_output_ratio = base_output_ratio * line_efficiency
         
         # Quality standard affects production time and cost
-        quality_multipliers = {"standard": 1.0, "premium": 1.3, "industrial_grade": 0.8}
-        quality_multiplier = quality_multipliers.get(quality_standard, 1.0)
+        quality_multiplier = _QUALITY_MULTIPLIERS.get(quality_standard, 1.0)
         
         adjusted_production_time = base_production_time * quality_multiplier
         adjusted_energy_cost = energy_cost * quality_multiplier
@@ -430,11 +452,10 @@ def run_manufacturing_operations(self) -> List[Dict]:
     max_jobs_per_line = 1  # Limit concurrent jobs per production line
     
     # Group active jobs by production line
-    active_lines = {}
-    for job in self.active_production_jobs.values():
-        recipe = self.manufacturing_recipes[job["recipe_name"]]
-        required_line = recipe.get("required_line", "default")
-        active_lines[required_line] = active_lines.get(required_line, 0) + 1
+    active_lines = Counter(
+        self.manufacturing_recipes[job["recipe_name"]].get("required_line", "default")
+        for job in self.active_production_jobs.values()
+    )
     
     # Start new jobs only if lines are available
     queue_index = 0
@@ -443,7 +464,7 @@ def run_manufacturing_operations(self) -> List[Dict]:
         required_line = self.manufacturing_recipes[next_job["recipe_name"]].get("required_line", "default")
         
         # Check if this production line is available
-        current_jobs_on_line = active_lines.get(required_line, 0)
+        current_jobs_on_line = active_lines[required_line]
         line_operational = self.production_line_status.get(required_line) == "operational"
         
         if current_jobs_on_line < max_jobs_per_line and line_operational:
@@ -454,7 +475,7 @@ def run_manufacturing_operations(self) -> List[Dict]:
             self.active_production_jobs[job_to_start["job_id"]] = job_to_start
             
             # Update active lines count
-            active_lines[required_line] = active_lines.get(required_line, 0) + 1
+            active_lines[required_line] += 1
             
             logger.info(f"Started manufacturing job {job_to_start['job_id']}: {job_to_start['recipe_name']}")
         else:
@@ -470,11 +491,8 @@ def run_manufacturing_operations(self) -> List[Dict]:
             bool: True if product passes quality control, False if it fails
         """
         # Base quality control success rates
-        base_rates = {"standard": 0.95, "premium": 0.90, "industrial_grade": 0.98}
-        qc_multipliers = {"basic": 0.95, "standard": 1.0, "enhanced": 1.05}
-        
-        base_rate = base_rates.get(quality_standard, 0.95)
-        qc_multiplier = qc_multipliers.get(qc_level, 1.0)
+        base_rate = _QC_BASE_RATES.get(quality_standard, 0.95)
+        qc_multiplier = _QC_MULTIPLIERS.get(qc_level, 1.0)
         
         success_rate = min(base_rate * qc_multiplier, 0.99)  # Cap at 99%
         
@@ -15,12 +15,33 @@ import logging
 from base_agent import BaseSupplyChainAgent
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import random
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Operator input specs that do not depend on the material or batch
+# (shared by every request, so each spec is read-only)
+_STATIC_REQUIRED_INPUTS = {
+    "processing_priority": MappingProxyType({
+        "type": "choice", 
+        "options": ("urgent", "normal", "batch_when_full"),
+        "description": "When should this processing job be scheduled?",
+        "default": "normal",
+        "required": True
+    }),
+    "quality_target": MappingProxyType({
+        "type": "float",
+        "min": 0.5,
+        "max": 1.0,
+        "description": "Target quality grade for processed material (0.5-1.0)",
+        "default": 0.85,
+        "required": True
+    })
+}
+
 class ProcessingAgent(BaseSupplyChainAgent):
     """
     Processing agent that transforms raw materials into refined products.
@@ -49,6 +70,11 @@ class ProcessingAgent(BaseSupplyChainAgent):
         self.transformation_recipes = transformation_recipes
         self.processing_capacity = processing_capacity
         
+        # Recipe names grouped by the material they accept (recipes are fixed after setup)
+        self._recipes_by_input: Dict[str, List[str]] = {}
+        for recipe_name, recipe_data in transformation_recipes.items():
+            self._recipes_by_input.setdefault(recipe_data["input_material"], []).append(recipe_name)
+        
         # Processing equipment status - each method has its own equipment
         self.equipment_status: Dict[str, str] = {}
         self.equipment_efficiency: Dict[str, float] = {}
@@ -95,12 +121,7 @@ class ProcessingAgent(BaseSupplyChainAgent):
         quality = shipment_data.get("ore_quality", 1.0)
         
         # Validation 1: Check if we can handle this ore type
-        can_process = any(
-            recipe["input_material"] == ore_type 
-            for recipe in self.transformation_recipes.values()
-        )
-        
-        if not can_process:
+        if ore_type not in self._recipes_by_input:
             logger.error(f"{self.name}: Cannot process {ore_type}. No recipes available.")
             return False
         
@@ -128,13 +149,12 @@ class ProcessingAgent(BaseSupplyChainAgent):
     def get_required_inputs(self, material_type: str, quantity: float) -> Dict[str, any]:
         """
         Define what operator inputs are needed for processing this material.
+        
+        The returned dict is new on every call, but the fixed specs inside it
+        are shared read-only mappings; copy a spec before changing it.
         """
         # Find applicable recipes for this material
-        applicable_recipes = [
-            (recipe_name, recipe_data) 
-            for recipe_name, recipe_data in self.transformation_recipes.items()
-            if recipe_data["input_material"] == material_type
-        ]
+        applicable_recipes = self._recipes_by_input.get(material_type)
         
         if not applicable_recipes:
             return {"error": f"No processing recipes available for {material_type}"}
@@ -143,25 +163,11 @@ class ProcessingAgent(BaseSupplyChainAgent):
         required_inputs = {
             "selected_recipe": {
                 "type": "choice",
-                "options": [recipe_name for recipe_name, _ in applicable_recipes],
+                "options": list(applicable_recipes),
                 "description": f"Choose processing method for {material_type}",
                 "required": True
             },
-            "processing_priority": {
-                "type": "choice", 
-                "options": ["urgent", "normal", "batch_when_full"],
-                "description": "When should this processing job be scheduled?",
-                "default": "normal",
-                "required": True
-            },
-            "quality_target": {
-                "type": "float",
-                "min": 0.5,
-                "max": 1.0,
-                "description": "Target quality grade for processed material (0.5-1.0)",
-                "default": 0.85,
-                "required": True
-            },
+            **_STATIC_REQUIRED_INPUTS,
             "batch_size": {
                 "type": "float",
                 "min": 1.0,
@@ -181,7 +187,7 @@ class ProcessingAgent(BaseSupplyChainAgent):
         # Use default inputs if none provided
         if operator_inputs is None:
             operator_inputs = {
-                "selected_recipe": list(self.transformation_recipes.keys())[0],
+                "selected_recipe": next(iter(self.transformation_recipes)),
                 "processing_priority": "normal",
                 "quality_target": 0.85,
                 "batch_size": min(quantity, self.processing_capacity * 0.5)
@@ -14,14 +14,90 @@ The retail agent completes the end-to-end supply chain from raw materials to cus
 
 import logging
 from base_agent import BaseSupplyChainAgent
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
+from types import MappingProxyType
 import random
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Operator input specs that are the same for every store and every order
+# (shared by all agents, so every level is read-only)
+_STATIC_REQUIRED_INPUTS = {
+    "pricing_strategy": MappingProxyType({
+        "type": "choice",
+        "options": ("standard", "promotional", "bulk_discount", "premium"),
+        "description": "What pricing strategy should be applied?",
+        "default": "standard",
+        "required": True
+    }),
+    "priority_level": MappingProxyType({
+        "type": "choice",
+        "options": ("standard", "high", "urgent"),
+        "description": "Order processing priority level",
+        "default": "standard",
+        "required": True
+    }),
+    "customer_type": MappingProxyType({
+        "type": "choice",
+        "options": ("new_customer", "returning_customer", "vip_customer", "wholesale_customer"),
+        "description": "What type of customer is this?",
+        "default": "returning_customer",
+        "required": True
+    })
+}
+
+# Extra input requested for fertilizer orders
+_APPLICATION_SEASON_INPUT = MappingProxyType({
+    "type": "choice",
+    "options": ("spring", "summer", "fall", "winter"),
+    "description": "Intended application season (affects pricing)",
+    "default": "spring",
+    "required": False
+})
+
+# Base pricing by product category
+_BASE_PRICES = MappingProxyType({
+    "Bagged_Fertilizer": 25.0,
+    "Steel_Beams": 150.0,
+    "Steel_Products": 120.0,
+    "Chemical_Products": 80.0,
+    "Industrial_Components": 200.0
+})
+
+# Price multipliers by pricing strategy (bulk_discount only applies above 50 units)
+_STRATEGY_MULTIPLIERS = MappingProxyType({
+    "standard": 1.0,
+    "promotional": 0.85,
+    "bulk_discount": 0.90,
+    "premium": 1.15
+})
+
+# Price multipliers by customer type
+_CUSTOMER_MULTIPLIERS = MappingProxyType({
+    "new_customer": 0.95,  # 5% discount for new customers
+    "returning_customer": 1.0,
+    "vip_customer": 0.90,  # 10% discount for VIP
+    "wholesale_customer": 0.80  # 20% discount for wholesale
+})
+
+# Delivery lead time in hours by method, plus extra hours by customer zone
+_DELIVERY_BASE_HOURS = MappingProxyType({
+    "standard_delivery": 48,
+    "express_delivery": 24,
+    "pickup": 2,
+    "bulk_delivery": 72
+})
+
+_ZONE_DELAY_HOURS = MappingProxyType({
+    "residential": 0,
+    "commercial": 4,
+    "industrial": 8,
+    "agricultural": 12
+})
+
 class RetailAgent(BaseSupplyChainAgent):
     """
     Retail agent that handles final customer sales and delivery operations.
@@ -50,10 +126,10 @@ class RetailAgent(BaseSupplyChainAgent):
         # Retail configuration
         self.sales_channels = sales_channels
         self.customer_zones = customer_zones
-        self.store_capacity = store_capacity
         
         # Product inventory and pricing
-        self.product_inventory: Dict[str, float] = {}  # Products available for sale
+        self._product_inventory: Dict[str, float] = {} # Products available for sale (see product_inventory)
+        self._inventory_total: float = 0.0             # Running sum of _product_inventory
         self.product_prices: Dict[str, float] = {}     # Current prices by product
         self.price_history: Dict[str, List[Dict]] = {} # Price change history
         self.product_demand: Dict[str, float] = {}     # Current demand levels
@@ -81,6 +157,9 @@ class RetailAgent(BaseSupplyChainAgent):
                 "customer_count": 0
             }
         
+        # Hashed copy for zone membership checks (the list keeps display order)
+        self._customer_zones_set = frozenset(customer_zones)
+        
         # Customer zone analytics
         self.zone_analytics: Dict[str, Dict] = {}
         for zone in customer_zones:
@@ -100,14 +179,72 @@ class RetailAgent(BaseSupplyChainAgent):
             "average_delivery_time_hours": 24.0
         }
         
+        # Operator inputs needed for every order at this store (built once, read-only)
+        self._base_required_inputs = MappingProxyType({
+            "sales_channel": MappingProxyType({
+                "type": "choice",
+                "options": tuple(self.sales_channels),
+                "description": "Which sales channel should handle this order?",
+                "required": True
+            }),
+            "delivery_method": MappingProxyType({
+                "type": "choice",
+                "options": tuple(self.delivery_methods),
+                "description": "How should this order be delivered?",
+                "default": "standard_delivery",
+                "required": True
+            }),
+            **_STATIC_REQUIRED_INPUTS
+        })
+        
         # Marketing and promotions
         self.active_promotions: Dict[str, Dict] = {}
         self.seasonal_demand_multipliers: Dict[str, float] = {}
         
+        # Order/customer aggregates for the status report, recomputed only after
+        # update_customer_record or complete_delivery bumps _status_version
+        self._status_version: int = 0
+        self._cached_aggregates_version: Optional[int] = None
+        self._cached_aggregates: Tuple[int, float, int, float] = (0, 100, 0, 0)
+        
+        # Private random generator so demand/pricing draws don't contend on the global state
+        self._rng = random.Random()
+        
         logger.info(f"Retail Agent {self.name} initialized")
         logger.info(f"Sales channels: {self.sales_channels}")
         logger.info(f"Customer zones: {self.customer_zones}")
     
+    @property
+    def store_capacity(self) -> float:
+        """
+        Maximum inventory capacity (units)
+        
+        The base agent already stores this as ``capacity``; this alias keeps the
+        retail-specific name without holding a second copy on every instance.
+        """
+        return self.capacity
+    
+    @store_capacity.setter
+    def store_capacity(self, value: float):
+        self.capacity = value
+    
+    @property
+    def product_inventory(self) -> Mapping[str, float]:
+        """
+        Products available for sale (units by product), as a read-only view
+        
+        Shipments and sales update the stock through the agent's own methods,
+        which also keep the running total used by the store-full check. Item
+        writes through this view raise TypeError; to replace the stock
+        wholesale, assign a new dict.
+        """
+        return MappingProxyType(self._product_inventory)
+    
+    @product_inventory.setter
+    def product_inventory(self, inventory: Dict[str, float]):
+        self._product_inventory = dict(inventory)
+        self._inventory_total = sum(self._product_inventory.values())
+    
     def receive_shipment_from_distribution(self, shipment_data: Dict) -> bool:
         """
         Receive a shipment of finished products from distribution centers
@@ -129,20 +266,21 @@ class RetailAgent(BaseSupplyChainAgent):
         product_type = shipment_data.get("material")
         quantity = shipment_data.get("quantity", 0.0)
         
-        # Validation 1: Check store capacity
-        current_inventory = sum(self.product_inventory.values())
-        if current_inventory + quantity > self.store_capacity:
-            available_space = self.store_capacity - current_inventory
+        # Validation 1: Check store capacity (reject outright when already full)
+        current_inventory = self._inventory_total
+        if current_inventory >= self.store_capacity:
+            logger.error(f"{self.name}: Store inventory full. Rejecting shipment.")
+            return False
+        
+        available_space = self.store_capacity - current_inventory
+        if quantity > available_space:
             logger.warning(f"{self.name}: Limited storage space. Can only accept {available_space} units of {quantity} requested")
-            
-            if available_space <= 0:
-                logger.error(f"{self.name}: Store inventory full. Rejecting shipment.")
-                return False
-            
             quantity = available_space
         
         # Accept the shipment
-        self.product_inventory[product_type] = self.product_inventory.get(product_type, 0.0) + quantity
+        current_stock = self._product_inventory.get(product_type, 0.0)
+        self._product_inventory[product_type] = current_stock + quantity
+        self._inventory_total += quantity
         
         # Set initial pricing if this is a new product
         if product_type not in self.product_prices:
@@ -150,10 +288,10 @@ class RetailAgent(BaseSupplyChainAgent):
         
         # Initialize demand tracking for new products
         if product_type not in self.product_demand:
-            self.product_demand[product_type] = random.uniform(0.3, 0.8)  # Random initial demand
+            self.product_demand[product_type] = self._rng.uniform(0.3, 0.8)  # Random initial demand
         
         logger.info(f"{self.name} received {quantity} units of {product_type}")
-        logger.info(f"Store inventory now: {sum(self.product_inventory.values()):.1f} units total")
+        logger.info(f"Store inventory now: {self._inventory_total:.1f} units total")
         
         return True
     
@@ -161,20 +299,11 @@ class RetailAgent(BaseSupplyChainAgent):
         """
         Set initial pricing for a new product based on product type
         """
-        # Base pricing by product category
-        base_prices = {
-            "Bagged_Fertilizer": 25.0,
-            "Steel_Beams": 150.0,
-            "Steel_Products": 120.0,
-            "Chemical_Products": 80.0,
-            "Industrial_Components": 200.0
-        }
-        
         # Find base price or use default
-        base_price = base_prices.get(product_type, 50.0)
+        base_price = _BASE_PRICES.get(product_type, 50.0)
         
         # Add some pricing variability (±15%)
-        price_variation = random.uniform(0.85, 1.15)
+        price_variation = self._rng.uniform(0.85, 1.15)
         initial_price = base_price * price_variation
         
         self.product_prices[product_type] = round(initial_price, 2)
@@ -196,68 +325,28 @@ class RetailAgent(BaseSupplyChainAgent):
             order_details: Details about the customer order
             
         Returns:
-            Dictionary of required operator inputs with descriptions
+            Dictionary of required operator inputs with descriptions. The dict
+            is new on every call; the fixed specs inside it are shared read-only
+            mappings, so copy a spec before changing it.
         """
         product_type = order_details.get("product_type", "")
-        quantity = order_details.get("quantity", 1.0)
         customer_zone = order_details.get("customer_zone", "")
         
-        required_inputs = {
-            "sales_channel": {
-                "type": "choice",
-                "options": self.sales_channels,
-                "description": "Which sales channel should handle this order?",
-                "required": True
-            },
-            "delivery_method": {
-                "type": "choice",
-                "options": self.delivery_methods,
-                "description": "How should this order be delivered?",
-                "default": "standard_delivery",
-                "required": True
-            },
-            "pricing_strategy": {
-                "type": "choice",
-                "options": ["standard", "promotional", "bulk_discount", "premium"],
-                "description": "What pricing strategy should be applied?",
-                "default": "standard",
-                "required": True
-            },
-            "priority_level": {
-                "type": "choice",
-                "options": ["standard", "high", "urgent"],
-                "description": "Order processing priority level",
-                "default": "standard",
-                "required": True
-            },
-            "customer_type": {
-                "type": "choice",
-                "options": ["new_customer", "returning_customer", "vip_customer", "wholesale_customer"],
-                "description": "What type of customer is this?",
-                "default": "returning_customer",
-                "required": True
-            }
-        }
+        required_inputs = {**self._base_required_inputs}
         
         # Add zone-specific options
-        if customer_zone in self.customer_zones:
-            required_inputs["local_delivery_options"] = {
+        if customer_zone in self._customer_zones_set:
+            required_inputs["local_delivery_options"] = MappingProxyType({
                 "type": "choice",
-                "options": ["same_day", "next_day", "scheduled"],
+                "options": ("same_day", "next_day", "scheduled"),
                 "description": f"Delivery options for {customer_zone}",
                 "default": "next_day",
                 "required": True
-            }
+            })
         
         # Add product-specific options
         if "Fertilizer" in product_type:
-            required_inputs["application_season"] = {
-                "type": "choice",
-                "options": ["spring", "summer", "fall", "winter"],
-                "description": "Intended application season (affects pricing)",
-                "default": "spring",
-                "required": False
-            }
+            required_inputs["application_season"] = _APPLICATION_SEASON_INPUT
         
         return required_inputs
     
@@ -285,7 +374,10 @@ class RetailAgent(BaseSupplyChainAgent):
         # Extract order details
         product_type = order_details.get("product_type", "")
         quantity = order_details.get("quantity", 1.0)
-        customer_id = order_details.get("customer_id", f"CUST_{random.randint(1000, 9999)}")
+        customer_id = order_details.get("customer_id")
+        if customer_id is None:
+            # Only draw a walk-in customer ID when the order doesn't carry one
+            customer_id = f"CUST_{self._rng.randint(1000, 9999)}"
         customer_zone = order_details.get("customer_zone", self.customer_zones[0] if self.customer_zones else "general")
         
         # Extract operator decisions
@@ -296,7 +388,7 @@ class RetailAgent(BaseSupplyChainAgent):
         customer_type = operator_inputs.get("customer_type", "returning_customer")
         
         # Validation 1: Check product availability
-        available_quantity = self.product_inventory.get(product_type, 0.0)
+        available_quantity = self._product_inventory.get(product_type, 0.0)
         if available_quantity < quantity:
             return {
                 "status": "error",
@@ -319,7 +411,8 @@ class RetailAgent(BaseSupplyChainAgent):
         order_id = f"ORDER_{self.agent_id}_{len(self.sales_history) + 1:04d}"
         
         # Reserve inventory
-        self.product_inventory[product_type] -= quantity
+        self._product_inventory[product_type] -= quantity
+        self._inventory_total -= quantity
         
         # Create order record
         order_record = {
@@ -373,22 +466,11 @@ class RetailAgent(BaseSupplyChainAgent):
         price = base_price
         
         # Apply pricing strategy
-        strategy_multipliers = {
-            "standard": 1.0,
-            "promotional": 0.85,
-            "bulk_discount": 0.90 if quantity > 50 else 1.0,
-            "premium": 1.15
-        }
-        price *= strategy_multipliers.get(pricing_strategy, 1.0)
+        if pricing_strategy != "bulk_discount" or quantity > 50:
+            price *= _STRATEGY_MULTIPLIERS.get(pricing_strategy, 1.0)
         
         # Apply customer type discounts
-        customer_multipliers = {
-            "new_customer": 0.95,  # 5% discount for new customers
-            "returning_customer": 1.0,
-            "vip_customer": 0.90,  # 10% discount for VIP
-            "wholesale_customer": 0.80  # 20% discount for wholesale
-        }
-        price *= customer_multipliers.get(customer_type, 1.0)
+        price *= _CUSTOMER_MULTIPLIERS.get(customer_type, 1.0)
         
         # Apply bulk quantity discounts
         if quantity > 100:
@@ -402,23 +484,10 @@ class RetailAgent(BaseSupplyChainAgent):
         """
         Calculate estimated delivery time based on method and zone
         """
-        base_hours = {
-            "standard_delivery": 48,
-            "express_delivery": 24,
-            "pickup": 2,
-            "bulk_delivery": 72
-        }
-        
-        hours = base_hours.get(delivery_method, 48)
+        hours = _DELIVERY_BASE_HOURS.get(delivery_method, 48)
         
         # Add zone-specific delays
-        zone_delays = {
-            "residential": 0,
-            "commercial": 4,
-            "industrial": 8,
-            "agricultural": 12
-        }
-        hours += zone_delays.get(customer_zone, 0)
+        hours += _ZONE_DELAY_HOURS.get(customer_zone, 0)
         
         return datetime.now() + timedelta(hours=hours)
     
@@ -444,6 +513,7 @@ class RetailAgent(BaseSupplyChainAgent):
         customer["total_spent"] += order_value
         customer["average_order_value"] = customer["total_spent"] / customer["total_orders"]
         customer["last_order_date"] = datetime.now()
+        self._status_version += 1
     
     def update_sales_metrics(self, sales_channel: str, customer_zone: str, order_value: float):
         """
@@ -489,6 +559,7 @@ class RetailAgent(BaseSupplyChainAgent):
         on_time = actual_delivery <= estimated_delivery
         
         order["delivered_on_time"] = on_time
+        self._status_version += 1
         
         # Update metrics
         self.total_sales_revenue += order["total_amount"]
@@ -514,40 +585,64 @@ class RetailAgent(BaseSupplyChainAgent):
         logger.info(f"Order {order_id} delivered successfully. On time: {on_time}")
         return True
     
+    def _order_and_customer_aggregates(self) -> Tuple[int, float, int, float]:
+        """
+        Order count, fulfillment rate, customer count and average satisfaction
+        
+        These scan the whole sales history and customer database, so they are
+        cached until update_customer_record or complete_delivery records a
+        change. Orders and customers must be changed through those methods;
+        direct edits to sales_history or customer_database are not seen until
+        the next one runs.
+        """
+        if self._cached_aggregates_version != self._status_version:
+            total_orders = len(self.sales_history)
+            delivered_orders = sum(1 for order in self.sales_history if order.get("status") == "delivered")
+            order_fulfillment_rate = (delivered_orders / total_orders * 100) if total_orders else 100
+            
+            total_customers = len(self.customer_database)
+            avg_customer_satisfaction = (
+                sum(customer["satisfaction_score"] for customer in self.customer_database.values()) / total_customers
+                if total_customers else 0
+            )
+            
+            self._cached_aggregates = (total_orders, order_fulfillment_rate, total_customers, avg_customer_satisfaction)
+            self._cached_aggregates_version = self._status_version
+        return self._cached_aggregates
+    
     def get_retail_status(self) -> Dict:
         """
         Get comprehensive status report of the retail operation
         
+        The report is a new plain dict on every call, with its own copies of
+        the nested sections, so callers may change or serialize it freely.
+        Everything except the order/customer aggregates is read live (see
+        _order_and_customer_aggregates).
+        
         Returns:
             Dictionary with complete retail operation status
         """
         base_status = super().get_status()
         
         # Calculate inventory metrics
-        total_inventory = sum(self.product_inventory.values())
+        total_inventory = self._inventory_total
         inventory_utilization = (total_inventory / self.store_capacity) * 100 if self.store_capacity else 0
         
-        # Calculate sales performance
-        total_orders = len(self.sales_history)
-        delivered_orders = sum(1 for order in self.sales_history if order.get("status") == "delivered")
-        order_fulfillment_rate = (delivered_orders / total_orders * 100) if total_orders else 100
-        
-        # Calculate customer metrics
-        total_customers = len(self.customer_database)
-        avg_customer_satisfaction = (
-            sum(customer["satisfaction_score"] for customer in self.customer_database.values()) / total_customers
-            if total_customers else 0
+        # Sales performance and customer metrics (cached aggregates)
+        total_orders, order_fulfillment_rate, total_customers, avg_customer_satisfaction = (
+            self._order_and_customer_aggregates()
         )
         
         retail_status = {
             **base_status,
-            "sales_channels": self.sales_channels,
-            "customer_zones": self.customer_zones,
+            "connections": list(self.connections),
+            "sales_channels": list(self.sales_channels),
+            "customer_zones": list(self.customer_zones),
             "inventory": {
                 "total_units": total_inventory,
                 "capacity_utilization_percent": round(inventory_utilization, 1),
-                "products_available": len(self.product_inventory),
-                "by_product": dict(self.product_inventory)
+                "products_available": len(self._product_inventory),
+                "by_product": dict(self._product_inventory)
             },
             "sales_performance": {
                 "total_revenue": round(self.total_sales_revenue, 2),
@@ -565,8 +660,13 @@ class RetailAgent(BaseSupplyChainAgent):
                 "active_orders": len(self.active_orders),
                 "pending_orders": len(self.pending_orders)
             },
-            "channel_performance": dict(self.channel_performance),
-            "zone_analytics": dict(self.zone_analytics),
+            "channel_performance": {
+                channel: dict(stats) for channel, stats in self.channel_performance.items()
+            },
+            "zone_analytics": {
+                zone: {**stats, "preferred_products": dict(stats["preferred_products"])}
+                for zone, stats in self.zone_analytics.items()
+            },
             "pricing": {
                 "products_with_pricing": len(self.product_prices),
                 "current_prices": dict(self.product_prices)
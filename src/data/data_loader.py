@@ -5,14 +5,137 @@ Excel Data Loader for Supply Chain Reconstruction
 Loads and processes client's historical data to configure the supply chain system.
 """
 
+import contextlib
+import functools
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
+from urllib.parse import quote
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Prefer pandas' Rust-backed calamine reader when it is installed
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
+
+# Parsed sheets are persisted as Parquet sidecars when pyarrow is available
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_CACHE_AVAILABLE = True
+except ImportError:
+    PARQUET_CACHE_AVAILABLE = False
+
+# Sheet-name filters for the extractors, compiled once per process
+PRODUCTION_SHEET_PATTERN = re.compile(r'production|output', re.IGNORECASE)
+EXPORT_SHEET_PATTERN = re.compile(r'export|sales', re.IGNORECASE)
+
+# Column layout of the extracted record frames
+PRODUCTION_COLUMNS = ['year', 'product', 'quantity', 'unit', 'source_sheet']
+EXPORT_COLUMNS = ['year', 'country', 'product', 'quantity', 'unit', 'source_sheet']
+
+# Shipping zone for each known export destination (anything else is Middle_East)
+COUNTRY_TO_ZONE: Dict[str, str] = {
+    **dict.fromkeys(['China', 'India', 'Japan', 'South Korea'], 'Asia_Pacific'),
+    **dict.fromkeys(['Germany', 'France', 'Netherlands', 'Turkey'], 'Europe'),
+    **dict.fromkeys(['Brazil', 'USA', 'Argentina', 'Mexico'], 'Americas'),
+    **dict.fromkeys(['Morocco', 'Egypt', 'South Africa'], 'Africa'),
+}
+
+
+def _peak(quantities: np.ndarray, default: float) -> float:
+    """Largest quantity, or the default when there is no data"""
+    return float(quantities.max()) if quantities.size else default
+
+
+def _year_columns(columns) -> Dict:
+    """Map 4-digit year column headers to their integer year"""
+    years = {}
+    for col in columns:
+        label = str(col)
+        if label.isdigit() and len(label) == 4:
+            years[col] = int(label)
+    return years
+
+
+def _open_excel(excel_path: Path) -> pd.ExcelFile:
+    """Open a workbook with the fastest available reader"""
+    if _EXCEL_ENGINE == 'calamine':
+        return pd.ExcelFile(excel_path, engine='calamine')
+    return pd.ExcelFile(excel_path)
+
+
+def _parse_sheet(path: str, sheet_name: str) -> pd.DataFrame:
+    """Parse one sheet, closing the workbook again straight away"""
+    with _open_excel(Path(path)) as workbook:
+        return workbook.parse(sheet_name)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_sheet_names(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """Sheet names once per (path, mtime, size); no workbook handle is kept open"""
+    with _open_excel(Path(path)) as workbook:
+        return tuple(workbook.sheet_names)
+
+
+def _sidecar_path(excel_path: Path, mtime_ns: int, size: int, sheet_name: str) -> Path:
+    """Parquet cache file for a sheet, stored in <workbook>.cache/<version>/ next to the workbook"""
+    cache_dir = excel_path.with_name(excel_path.name + '.cache')
+    return cache_dir / f"{mtime_ns}-{size}" / f"{quote(sheet_name, safe='')}.parquet"
+
+
+def _write_sidecar(df: pd.DataFrame, sidecar: Path):
+    """Persist a parsed sheet; sheets Parquet cannot represent are left uncached"""
+    version_dir = sidecar.parent
+    tmp_path = None
+    try:
+        if not version_dir.exists():
+            # Caches of older workbook versions can never be read again
+            for stale_dir in version_dir.parent.glob('*-*'):
+                shutil.rmtree(stale_dir, ignore_errors=True)
+            version_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Write beside the target and rename, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=version_dir, suffix='.tmp')
+        os.close(fd)
+        # Parquet needs string headers; the extractors only compare headers as strings
+        df.rename(columns=str).to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, sidecar)
+    except (OSError, TypeError, ValueError) as e:
+        if tmp_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+        logger.debug(f"Not caching {sidecar.name}: {e}")
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_sheet(path: str, mtime_ns: int, size: int, sheet_name: str) -> pd.DataFrame:
+    """Parse a sheet once per workbook version (shared; loaders take a copy, see _get_sheet)"""
+    if not PARQUET_CACHE_AVAILABLE:
+        return _parse_sheet(path, sheet_name)
+    
+    # Sidecars live in a directory named after the workbook version they were parsed from
+    sidecar = _sidecar_path(Path(path), mtime_ns, size, sheet_name)
+    if sidecar.exists():
+        try:
+            return pd.read_parquet(sidecar)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache {sidecar}: {e}")
+    
+    df = _parse_sheet(path, sheet_name)
+    _write_sidecar(df, sidecar)
+    return df
+
+
 class SupplyChainDataLoader:
     """Load and process client Excel data for supply chain reconstruction"""
     
@@ -24,22 +147,41 @@ class SupplyChainDataLoader:
             excel_path: Path to client's Excel file
         """
         self.excel_path = Path(excel_path)
-        self.raw_data = {}
+        self.raw_data = {}          # Parsed sheets, filled lazily by _get_sheet
         self.processed_data = {}
+        self._source_key: Optional[tuple] = None  # (path, mtime_ns, size) for the parse caches
         
         if not self.excel_path.exists():
             raise FileNotFoundError(f"Excel file not found: {excel_path}")
         
         logger.info(f"Initialized data loader for: {excel_path}")
     
+    def _cache_key(self) -> tuple:
+        """Identify this workbook version for the module-level parse caches"""
+        if self._source_key is None:
+            stat = self.excel_path.stat()
+            self._source_key = (str(self.excel_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        return self._source_key
+    
+    def _sheet_names(self) -> Tuple[str, ...]:
+        """Sheet names of the workbook, read on first use"""
+        return _cached_sheet_names(*self._cache_key())
+    
+    def _get_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """Parse a sheet on first use and memoize it in raw_data"""
+        if sheet_name not in self.raw_data:
+            # raw_data is public, so each loader gets its own copy of the shared parse
+            self.raw_data[sheet_name] = _cached_sheet(*self._cache_key(), sheet_name).copy()
+            logger.info(f"Loaded sheet: {sheet_name}")
+        return self.raw_data[sheet_name]
+    
     def load_all_sheets(self) -> Dict:
-        """Load all sheets from the Excel file"""
+        """Load the production/export/sales sheets from the Excel file"""
         try:
-            xl = pd.ExcelFile(self.excel_path)
-            
-            for sheet_name in xl.sheet_names:
-                self.raw_data[sheet_name] = xl.parse(sheet_name)
-                logger.info(f"Loaded sheet: {sheet_name}")
+            for sheet_name in self._sheet_names():
+                # Only sheets the extractors consume
+                if PRODUCTION_SHEET_PATTERN.search(sheet_name) or EXPORT_SHEET_PATTERN.search(sheet_name):
+                    self._get_sheet(sheet_name)
             
             return self.raw_data
         
@@ -49,88 +191,126 @@ class SupplyChainDataLoader:
     
     def extract_production_data(self) -> List[Dict]:
         """Extract historical production data"""
-        production_records = []
+        frames = []
         
         # Look for production data in various sheet formats
-        for sheet_name, df in self.raw_data.items():
-            if 'production' in sheet_name.lower() or 'output' in sheet_name.lower():
-                # Process production sheet
-                for _, row in df.iterrows():
-                    # Extract year columns (assuming years are column headers)
-                    for col in df.columns:
-                        if str(col).isdigit() and len(str(col)) == 4:  # Year columns
-                            year = int(col)
-                            value = row[col]
-                            
-                            if pd.notnull(value) and value > 0:
-                                production_records.append({
-                                    'year': year,
-                                    'product': str(row.iloc[0]) if pd.notnull(row.iloc[0]) else 'Unknown',
-                                    'quantity': float(value),
-                                    'unit': 'tons',  # Assume tons, could be refined
-                                    'source_sheet': sheet_name
-                                })
-        
+        for sheet_name in self._sheet_names():
+            if PRODUCTION_SHEET_PATTERN.search(sheet_name):
+                df = self._get_sheet(sheet_name)
+                
+                # Year columns are fixed per sheet (assuming years are column headers)
+                year_cols = _year_columns(df.columns[1:])
+                if not year_cols:
+                    continue
+                product_col = df.columns[0]
+                
+                # Reshape to one (product, year, value) row per cell and filter in bulk
+                long_df = (
+                    df[[product_col, *year_cols]]
+                    .melt(id_vars=product_col, var_name='year', value_name='quantity', ignore_index=False)
+                    .sort_index(kind='stable')  # keep the original row-by-row record order
+                    .reset_index(drop=True)
+                )
+                long_df['quantity'] = pd.to_numeric(long_df['quantity'], errors='coerce').astype(float)
+                long_df = long_df[long_df['quantity'].gt(0)]
+                products = long_df[product_col]
+                
+                frames.append(long_df.assign(
+                    year=long_df['year'].map(year_cols),
+                    product=products.where(products.notna(), 'Unknown').astype(str),
+                    unit='tons',  # Assume tons, could be refined
+                    source_sheet=sheet_name
+                )[PRODUCTION_COLUMNS])
+        
+        # Keep the columnar frame for aggregation alongside the record list
+        production_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PRODUCTION_COLUMNS)
+        production_records = production_df.to_dict('records')
+        
+        self.processed_data['production_df'] = production_df
         self.processed_data['production'] = production_records
         logger.info(f"Extracted {len(production_records)} production records")
         return production_records
     
     def extract_export_data(self) -> List[Dict]:
         """Extract export/sales data"""
-        export_records = []
+        frames = []
+        header_labels = ['product', 'tons', 'usd']
         
-        for sheet_name, df in self.raw_data.items():
-            if 'export' in sheet_name.lower() or 'sales' in sheet_name.lower():
-                current_country = None
+        for sheet_name in self._sheet_names():
+            if EXPORT_SHEET_PATTERN.search(sheet_name):
+                df = self._get_sheet(sheet_name)
                 
-                for _, row in df.iterrows():
-                    # Country identification
-                    first_col = str(row.iloc[0]) if pd.notnull(row.iloc[0]) else ''
-                    if first_col and not first_col.lower() in ['product', 'tons', 'usd']:
-                        current_country = first_col.strip()
-                    
-                    # Product identification
-                    product = str(row.iloc[1]) if len(row) > 1 and pd.notnull(row.iloc[1]) else ''
-                    if not product or product.lower() in ['product', 'tons', 'usd']:
-                        continue
-                    
-                    # Extract yearly data
-                    for col in df.columns:
-                        if str(col).isdigit() and len(str(col)) == 4:
-                            year = int(col)
-                            value = pd.to_numeric(row[col], errors='coerce')
-                            
-                            if pd.notnull(value) and value > 0:
-                                export_records.append({
-                                    'year': year,
-                                    'country': current_country,
-                                    'product': product,
-                                    'quantity': float(value),
-                                    'unit': 'tons',
-                                    'source_sheet': sheet_name
-                                })
-        
+                year_cols = _year_columns(df.columns[2:])
+                if not year_cols:
+                    continue
+                
+                # Country identification: carry the last country label down the sheet
+                first_col = df.iloc[:, 0]
+                first_str = first_col.astype(str)
+                is_country = first_col.notna() & first_str.ne('') & ~first_str.str.lower().isin(header_labels)
+                countries = first_str.str.strip().where(is_country).ffill()
+                
+                # Product identification: skip blank and header rows
+                product_col = df.iloc[:, 1]
+                products = product_col.astype(str)
+                is_product = product_col.notna() & products.ne('') & ~products.str.lower().isin(header_labels)
+                
+                # Extract yearly data for all product rows at once
+                long_df = (
+                    df.loc[is_product, list(year_cols)]
+                    .assign(_country=countries[is_product], _product=products[is_product])
+                    .melt(id_vars=['_country', '_product'], var_name='year', value_name='quantity', ignore_index=False)
+                    .sort_index(kind='stable')  # keep the original row-by-row record order
+                    .reset_index(drop=True)
+                )
+                long_df['quantity'] = pd.to_numeric(long_df['quantity'], errors='coerce').astype(float)
+                long_df = long_df[long_df['quantity'].gt(0)]
+                long_countries = long_df['_country'].astype(object)
+                
+                frames.append(long_df.assign(
+                    year=long_df['year'].map(year_cols),
+                    country=long_countries.where(long_countries.notna(), None),
+                    product=long_df['_product'],
+                    unit='tons',
+                    source_sheet=sheet_name
+                )[EXPORT_COLUMNS])
+        
+        exports_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=EXPORT_COLUMNS)
+        export_records = exports_df.to_dict('records')
+        
+        self.processed_data['exports_df'] = exports_df
         self.processed_data['exports'] = export_records
         logger.info(f"Extracted {len(export_records)} export records")
         return export_records
     
     def configure_agents_from_data(self) -> Dict:
         """Configure agent parameters based on historical data"""
+        production_df = self._records_frame('production_df', PRODUCTION_COLUMNS)
+        exports_df = self._records_frame('exports_df', EXPORT_COLUMNS)
+        
+        # Each upstream stage is sized once and handed to the stage it feeds
+        mining_config = self._configure_mining(production_df)
+        processing_config = self._configure_processing(mining_config)
+        
         config = {
-            'mining': self._configure_mining(),
-            'processing': self._configure_processing(),
-            'manufacturing': self._configure_manufacturing(),
-            'distribution': self._configure_distribution(),
-            'retail': self._configure_retail()
+            'mining': mining_config,
+            'processing': processing_config,
+            'manufacturing': self._configure_manufacturing(production_df, processing_config),
+            'distribution': self._configure_distribution(exports_df),
+            'retail': self._configure_retail(exports_df)
         }
         
         return config
     
-    def _configure_mining(self) -> Dict:
+    def _records_frame(self, key: str, columns: List[str]) -> pd.DataFrame:
+        """Extracted records as a DataFrame (empty until the extractor has run)"""
+        return self.processed_data.get(key, pd.DataFrame(columns=columns))
+    
+    def _configure_mining(self, production_df: pd.DataFrame) -> Dict:
         """Configure mining agent based on production data"""
-        production_data = self.processed_data.get('production', [])
+        production_qty = production_df['quantity'].to_numpy(dtype=np.float64)
         
-        if not production_data:
+        if not production_qty.size:
             return {
                 'capacity': 500000.0,
                 'extraction_rate': 2000.0,
@@ -138,7 +318,7 @@ class SupplyChainDataLoader:
             }
         
         # Calculate max annual production to size mine
-        max_annual = max([p['quantity'] for p in production_data], default=100000)
+        max_annual = _peak(production_qty, 100000)
         
         # Size mine for 1.5x peak production
         mine_capacity = max_annual * 1.5
@@ -146,7 +326,8 @@ class SupplyChainDataLoader:
         hourly_rate = daily_rate / 24
         
         # Determine ore types from production data
-        ore_types = list(set([p['product'] for p in production_data if 'ore' in p['product'].lower()]))
+        products = production_df['product']
+        ore_types = products[products.str.contains('ore', case=False, na=False)].unique().tolist()
         if not ore_types:
             ore_types = ['Phosphorite Ore']  # Default
         
@@ -157,26 +338,20 @@ class SupplyChainDataLoader:
             'historical_peak': max_annual
         }
     
-    def _configure_processing(self) -> Dict:
+    def _configure_processing(self, mining_config: Dict) -> Dict:
         """Configure processing based on production data"""
         # Processing capacity should handle mining output
-        mining_config = self._configure_mining()
-        
         return {
             'capacity': mining_config['capacity'] * 0.7,  # 70% of mining capacity
             'processing_methods': ['chemical_processing', 'beneficiation'],
             'efficiency': 0.82  # Based on typical phosphate processing
         }
     
-    def _configure_manufacturing(self) -> Dict:
+    def _configure_manufacturing(self, production_df: pd.DataFrame, processing_config: Dict) -> Dict:
         """Configure manufacturing based on product mix"""
-        production_data = self.processed_data.get('production', [])
-        
         # Identify product types
-        products = [p['product'] for p in production_data]
-        fertilizer_products = [p for p in products if any(term in p.lower() for term in ['dap', 'tsp', 'fertilizer'])]
-        
-        processing_config = self._configure_processing()
+        products = production_df['product']
+        fertilizer_products = products[products.str.contains('dap|tsp|fertilizer', case=False, na=False)].tolist()
         
         return {
             'capacity': processing_config['capacity'] * 0.6,  # 60% of processing
@@ -184,31 +359,18 @@ class SupplyChainDataLoader:
             'product_mix': fertilizer_products or ['DAP_Fertilizer', 'TSP_Fertilizer']
         }
     
-    def _configure_distribution(self) -> Dict:
+    def _configure_distribution(self, exports_df: pd.DataFrame) -> Dict:
         """Configure distribution based on export data"""
-        export_data = self.processed_data.get('exports', [])
-        
         # Extract destination countries/regions
-        countries = list(set([e['country'] for e in export_data if e['country']]))
+        countries = exports_df['country']
+        countries = countries[countries.notna() & countries.ne('')].unique().tolist()
         
         # Map to shipping zones
-        zones = []
-        for country in countries:
-            if country in ['China', 'India', 'Japan', 'South Korea']:
-                zones.append('Asia_Pacific')
-            elif country in ['Germany', 'France', 'Netherlands', 'Turkey']:
-                zones.append('Europe')
-            elif country in ['Brazil', 'USA', 'Argentina', 'Mexico']:
-                zones.append('Americas')
-            elif country in ['Morocco', 'Egypt', 'South Africa']:
-                zones.append('Africa')
-            else:
-                zones.append('Middle_East')
-        
-        zones = list(set(zones)) or ['Asia_Pacific', 'Europe', 'Americas']
+        zones = {COUNTRY_TO_ZONE.get(country, 'Middle_East') for country in countries}
+        zones = list(zones) or ['Asia_Pacific', 'Europe', 'Americas']
         
         # Size warehouse for export volumes
-        max_export = max([e['quantity'] for e in export_data], default=50000)
+        max_export = _peak(exports_df['quantity'].to_numpy(dtype=np.float64), 50000)
         
         return {
             'capacity': max_export * 2,  # 2x peak export volume
@@ -216,22 +378,20 @@ class SupplyChainDataLoader:
             'export_countries': countries
         }
     
-    def _configure_retail(self) -> Dict:
+    def _configure_retail(self, exports_df: pd.DataFrame) -> Dict:
         """Configure retail based on customer mix"""
-        export_data = self.processed_data.get('exports', [])
-        
         # Determine sales channels based on export patterns
         sales_channels = ['bulk_export', 'container_export']
-        if any('domestic' in str(e.get('country', '')).lower() for e in export_data):
+        if exports_df['country'].str.contains('domestic', case=False, na=False).any():
             sales_channels.append('domestic_sales')
         
         # Customer zones based on product types
         customer_zones = ['agricultural', 'industrial']
-        if any('government' in str(e.get('product', '')).lower() for e in export_data):
+        if exports_df['product'].str.contains('government', case=False, na=False).any():
             customer_zones.append('government')
         
         # Size retail capacity
-        max_sales = max([e['quantity'] for e in export_data], default=100000)
+        max_sales = _peak(exports_df['quantity'].to_numpy(dtype=np.float64), 100000)
         
         return {
             'capacity': max_sales * 3,  # 3x peak sales volume
@@ -242,42 +402,40 @@ class SupplyChainDataLoader:
     
     def generate_simulation_scenario(self, target_year: int = None) -> Dict:
         """Generate a simulation scenario based on historical data"""
+        production_df = self._records_frame('production_df', PRODUCTION_COLUMNS)
+        exports_df = self._records_frame('exports_df', EXPORT_COLUMNS)
+        
         if target_year is None:
             # Use most recent year with data
-            years = [p['year'] for p in self.processed_data.get('production', [])]
-            target_year = max(years) if years else 2024
+            target_year = int(production_df['year'].max()) if len(production_df) else 2024
         
         # Get production target for the year
-        year_production = [p for p in self.processed_data.get('production', []) if p['year'] == target_year]
+        year_production = production_df[production_df['year'] == target_year]
         
-        if year_production:
-            total_production = sum([p['quantity'] for p in year_production])
+        if len(year_production):
+            total_production = float(year_production['quantity'].sum())
             # Estimate raw ore needed (assuming 3:1 ratio for phosphate)
             raw_ore_needed = total_production * 3.2
         else:
             raw_ore_needed = 100000  # Default
         
-        # Get export targets
-        year_exports = [e for e in self.processed_data.get('exports', []) if e['year'] == target_year]
+        # Get export targets, one product -> quantity mapping per country
+        year_exports = exports_df[exports_df['year'] == target_year]
         export_targets = {}
-        for export in year_exports:
-            country = export['country']
-            if country not in export_targets:
-                export_targets[country] = {}
-            export_targets[country][export['product']] = export['quantity']
+        for country, group in year_exports.groupby('country', sort=False, dropna=False):
+            export_targets[None if pd.isna(country) else country] = dict(zip(group['product'], group['quantity']))
         
         return {
             'target_year': target_year,
             'raw_ore_injection': raw_ore_needed,
-            'production_targets': {p['product']: p['quantity'] for p in year_production},
+            'production_targets': year_production.set_index('product')['quantity'].to_dict(),
             'export_targets': export_targets,
             'agent_config': self.configure_agents_from_data()
         }
     
     def create_supply_chain_from_data(self, system_class):
         """Create and configure a supply chain system using historical data"""
-        # Load and process all data
-        self.load_all_sheets()
+        # Process all data (sheets are parsed on demand by the extractors)
         self.extract_production_data()
         self.extract_export_data()
         
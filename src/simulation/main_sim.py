@@ -11,113 +11,404 @@ Usage:
     python enhanced_supply_chain_simulator.py
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import functools
+import io
 import logging 
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import random
+from typing import Any, ClassVar, Dict, List, Optional, Sequence
 from pathlib import Path 
 import json
+import re
 import sys
+import time
 import os
-import importlib.util
+from types import MappingProxyType
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# ANSI "erase display" + "cursor home" (avoids spawning cls/clear for every screen)
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+
+def _enable_windows_ansi():
+    """Enable VT escape processing on the Windows console (no-op elsewhere)"""
+    if os.name != 'nt':
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except Exception:
+        pass
+
+
+def _format_menu(labels) -> str:
+    """Render numbered menu lines ("  1. label") as one block"""
+    return "\n".join(f"  {i}. {label}" for i, label in enumerate(labels, 1))
+
+
+@functools.lru_cache(maxsize=None)
+def _choice_menu(options: tuple, default: Optional[str]) -> str:
+    """Numbered menu for _get_choice, rendered once per option set"""
+    return _format_menu(f"{option}{' (default)' if option == default else ''}" for option in options)
+
+
+@functools.lru_cache(maxsize=None)
+def _choice_index(options: tuple) -> Dict[str, str]:
+    """Accepted _get_choice answers ("1", "2", ... or the option name) mapped to the option"""
+    index = {option.lower(): option for option in options}
+    index.update((str(i), option) for i, option in enumerate(options, 1))
+    return index
+
+
+# Static interface banners, written with a single sys.stdout.write each
+_WELCOME_BANNER = (
+    "🏭 INTERACTIVE SUPPLY CHAIN SIMULATION SYSTEM\n"
+    f"{'=' * 60}\n"
+    "Welcome to the Supply Chain Reconstruction Platform!\n"
+    "This system will guide you through setting up and running\n"
+    "a complete supply chain simulation from raw materials to customers.\n"
+    "\n"
+)
+_OVERVIEW_HEADER = f"📊 SIMULATION OVERVIEW SETUP\n{'=' * 40}\n"
+_MINING_HEADER = f"\n⛏️  MINING FACILITY CONFIGURATION\n{'=' * 40}\n"
+_PROCESSING_HEADER = f"\n⚗️  PROCESSING FACILITY CONFIGURATION\n{'=' * 40}\n"
+_MANUFACTURING_HEADER = f"\n🏭 MANUFACTURING FACILITY CONFIGURATION\n{'=' * 40}\n"
+_DISTRIBUTION_HEADER = f"\n📦 DISTRIBUTION CENTER CONFIGURATION\n{'=' * 40}\n"
+_SALES_HEADER = f"\n🛒 SALES ORGANIZATION CONFIGURATION\n{'=' * 40}\n"
+
+_MAIN_HEADER = (
+    "🏭 SUPPLY CHAIN SIMULATOR - OBSIDIAN INTEGRATION\n"
+    f"{'=' * 60}\n"
+    "📝 All simulation data will be saved to your Obsidian vault\n"
+    "🚫 No local files will be created in the repository\n"
+    "\n"
+)
+
+# Simulator run and stage headers
+_RUN_HEADER = f"🚀 STARTING INTERACTIVE SUPPLY CHAIN SIMULATION\n{'=' * 60}\n"
+_STAGE_MINING_HEADER = f"\n🔨 STAGE 1: MINING EXTRACTION\n{'=' * 40}\n"
+_STAGE_PROCESSING_HEADER = f"\n⚗️ STAGE 2: PROCESSING\n{'=' * 40}\n"
+_STAGE_MANUFACTURING_HEADER = f"\n🏭 STAGE 3: MANUFACTURING\n{'=' * 40}\n"
+_STAGE_DISTRIBUTION_HEADER = f"\n📦 STAGE 4: DISTRIBUTION\n{'=' * 40}\n"
+_STAGE_SALES_HEADER = f"\n🛒 STAGE 5: SALES & CUSTOMER DELIVERY\n{'=' * 40}\n"
+_RESULTS_HEADER = f"\n📊 GENERATING FINAL RESULTS\n{'=' * 40}\n"
+_SAVING_HEADER = f"\n💾 SAVING SIMULATION DATA TO OBSIDIAN\n{'=' * 40}\n"
+
+# Padded stage column of the material-flow table
+_FLOW_STAGE_LABELS = {
+    stage: stage.upper().ljust(12)
+    for stage in ('mining', 'processing', 'manufacturing', 'distribution', 'sales')
+}
+
+# Static setup menus, rendered once at import
+ORE_OPTIONS = (
+    ("Phosphorite Ore", "For fertilizer production (P2O5 content)"),
+    ("Iron Ore", "For steel and metal production"),
+    ("Bauxite", "For aluminum production"),
+    ("Copper Ore", "For copper and electrical applications"),
+    ("Gold Ore", "Precious metal extraction"),
+    ("Limestone", "For cement and construction materials")
+)
+ORE_MENU = _format_menu(f"{ore} - {desc}" for ore, desc in ORE_OPTIONS)
+
+def _options(*labels: str) -> tuple:
+    """Option tuple of interned labels"""
+    return tuple(map(sys.intern, labels))
+
+
+@functools.lru_cache(maxsize=None)
+def _processed_material_name(ore_type: str) -> str:
+    """Interned inventory key for processed ore, e.g. 'Processed_Iron_Ore'"""
+    return sys.intern(f"Processed_{ore_type.replace(' ', '_')}")
+
+
+# Operator choice lists; labels are interned so every menu, answer and logged
+# decision refers to the same string object
+SIMULATION_TYPES = _options(
+    "Mining to Manufacturing (Phosphate/Fertilizer)",
+    "Mining to Steel Production",
+    "Full End-to-End (Mining to Customer)",
+    "Custom Supply Chain"
+)
+TIME_HORIZONS = _options("1 Month", "3 Months", "6 Months", "1 Year", "Custom")
+OPERATING_REGIONS = _options(
+    "Middle East (Saudi Arabia/UAE)",
+    "North America",
+    "Europe",
+    "Asia Pacific",
+    "South America",
+    "Other"
+)
+QUALITY_STANDARDS = _options("Export Grade", "Premium", "Standard", "Industrial Grade")
+PRICING_STRATEGIES = _options(
+    "Market Rate Pricing",
+    "Competitive Pricing",
+    "Premium Pricing",
+    "Cost-Plus Pricing",
+    "Contract-Based Pricing"
+)
+PAYMENT_TERMS = _options("Cash in Advance", "Letter of Credit", "Open Account", "Documentary Collection")
+PROCESSING_RECIPES = _options(
+    "Standard Processing",
+    "High Quality Processing",
+    "Fast Processing",
+    "Efficient Processing"
+)
+PROCESSING_PRIORITIES = _options("Urgent", "Normal", "Batch Optimize")
+MANUFACTURED_PRODUCTS = _options("DAP Fertilizer", "TSP Fertilizer", "NPK Compound", "Industrial Grade")
+QUALITY_LEVELS = _options("Export Grade", "Premium", "Standard", "Industrial")
+PRODUCTION_RATES = _options("Maximum", "Optimal", "Conservative")
+PACKAGING_OPTIONS = _options("Bulk", "50kg Bags", "1000kg Bags", "Custom Packaging")
+EXPORT_DESTINATIONS = _options("China", "India", "Brazil", "Germany", "UAE")
+SHIPPING_METHODS = _options("Bulk Carrier", "Container Ship", "Combined Transport")
+DELIVERY_SCHEDULES = _options("Immediate", "Scheduled", "Seasonal Optimal", "Cost Optimal")
+CUSTOMER_TYPES = _options(
+    "Agricultural Coop",
+    "Industrial Manufacturer",
+    "Trading Company",
+    "Government Agency"
+)
+PRICING_APPROACHES = _options("Market Rate", "Competitive Price", "Premium Price", "Contract Price")
+SALES_CHANNELS = _options("Bulk Export", "Container Export", "Domestic Sales", "Spot Market")
+SALES_PAYMENT_TERMS = _options("Cash Advance", "Letter of Credit", "Open Account", "Documentary Collection")
+
+EQUIPMENT_TYPES = ("Drilling Equipment", "Excavation Equipment", "Transport Equipment", "Crushing Equipment")
+EQUIPMENT_STATUS_CODES = dict(zip("OMR", _options("Operational", "Maintenance Required", "Under Repair")))
+_EQUIPMENT_STATUS_PROMPT = (
+    f"Enter one status code per unit ({', '.join(EQUIPMENT_TYPES)}), "
+    f"e.g. OOMO [{'O' * len(EQUIPMENT_TYPES)}]: "
+)
+
+PROCESSING_METHODS = (
+    "Chemical Processing (Acid treatment, beneficiation)",
+    "Physical Processing (Crushing, grinding, separation)",
+    "Thermal Processing (Smelting, roasting)",
+    "Beneficiation (Flotation, magnetic separation)",
+    "Hydrometallurgy (Leaching, extraction)"
+)
+PROCESSING_METHOD_MENU = _format_menu(PROCESSING_METHODS)
+
+PRODUCT_OPTIONS = (
+    ("DAP Fertilizer", "Di-Ammonium Phosphate fertilizer"),
+    ("TSP Fertilizer", "Triple Super Phosphate fertilizer"),
+    ("MAP Fertilizer", "Mono-Ammonium Phosphate fertilizer"),
+    ("NPK Compound", "Nitrogen-Phosphorus-Potassium compound"),
+    ("Steel Products", "Steel beams, rebar, structural steel"),
+    ("Industrial Chemicals", "Phosphoric acid, sulfuric acid"),
+    ("Custom Product", "Specify your own product")
+)
+PRODUCT_MENU = _format_menu(f"{product} - {desc}" for product, desc in PRODUCT_OPTIONS)
+
+_EXPORT_REGION_COUNTRIES = {
+    "Asia Pacific": ("China", "India", "Japan", "South Korea", "Australia", "Singapore"),
+    "Europe": ("Germany", "France", "Netherlands", "Turkey", "UK", "Italy"),
+    "Americas": ("USA", "Brazil", "Argentina", "Mexico", "Canada"),
+    "Africa": ("Morocco", "Egypt", "South Africa", "Nigeria", "Kenya"),
+    "Middle East": ("UAE", "Iraq", "Kuwait", "Jordan", "Qatar")
+}
+# (region, countries, pre-rendered region block) in display order
+EXPORT_COUNTRY_REGIONS = tuple(
+    (region, countries, f"\n{region}:\n{_format_menu(countries)}\n")
+    for region, countries in _EXPORT_REGION_COUNTRIES.items()
+)
+
+
+# Rates and factors used by the stage executors (fallbacks live at the .get call sites)
+QUALITY_FACTORS = MappingProxyType({"Export Grade": 0.95, "Premium": 0.92, "Standard": 0.94, "Industrial": 0.97})
+SHIPPING_COST_PER_TON = MappingProxyType({"Bulk Carrier": 25, "Container Ship": 45, "Combined Transport": 35})
+DELIVERY_DAYS = MappingProxyType({"Immediate": 14, "Scheduled": 21, "Seasonal Optimal": 35, "Cost Optimal": 28})
+BASE_PRICES = MappingProxyType({"DAP Fertilizer": 320, "TSP Fertilizer": 285, "NPK Compound": 350})
+PRICE_MULTIPLIERS = MappingProxyType({
+    "Market Rate": 1.0, "Competitive Price": 0.95,
+    "Premium Price": 1.08, "Contract Price": 0.98
+})
+
+
+# Comma-separated menu numbers, e.g. "1,3, 4"
+_CSV_INT_RE = re.compile(r"\s*\d+(?:\s*,\s*\d+)*\s*")
+
+
+def _parse_csv_indices(text: str) -> Optional[List[int]]:
+    """Zero-based indices from a '1,3,4' style answer, or None if it is malformed"""
+    if not _CSV_INT_RE.fullmatch(text):
+        return None
+    return [int(x) - 1 for x in text.split(',')]
+
+
+def _range_error(value: float, min_val: Optional[float], max_val: Optional[float]) -> Optional[str]:
+    """Validation message for a value outside [min_val, max_val], or None if it is in range"""
+    if min_val is not None and value < min_val:
+        return f"❌ Value must be at least {min_val:,.0f}"
+    if max_val is not None and value > max_val:
+        return f"❌ Value must be at most {max_val:,.0f}"
+    return None
+
+
+def _clamp(value: float, min_val: Optional[float], max_val: Optional[float]) -> float:
+    """value limited to [min_val, max_val]; a None bound is open"""
+    if min_val is not None:
+        value = max(min_val, value)
+    if max_val is not None:
+        value = min(max_val, value)
+    return value
+
+
+def _ask(prompt: str = "") -> str:
+    """Read one line of operator input (a leaner input() for the many prompts)"""
+    if prompt:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line[:-1] if line.endswith("\n") else line
+
+
+def _ns_to_iso(ns: int) -> str:
+    """ISO-8601 local time for a time.time_ns() stamp"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+
+# src/ directory and the places obsidian_auto_saver.py may live, resolved once at import
+_SRC_DIR = Path(__file__).resolve().parents[1]
+_OBSIDIAN_SAVER_FILES = (
+    _SRC_DIR / 'Obsidian Integration' / 'obsidian_auto_saver.py',
+    _SRC_DIR / 'Obsidian_Integration' / 'obsidian_auto_saver.py',
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_obsidian_saver_cls():
+    """Import ObsidianAutoSaver once per process, even if its folder has spaces."""
+    # Try loading from file path: src/Obsidian Integration/obsidian_auto_saver.py
+    candidate_file = next((path for path in _OBSIDIAN_SAVER_FILES if path.exists()), None)
+
+    ObsidianAutoSaver = None
+    if candidate_file is not None:
+        import importlib.util  # only needed on this one-time load path
+        spec = importlib.util.spec_from_file_location('obsidian_auto_saver', str(candidate_file))
+        module = importlib.util.module_from_spec(spec)
+        assert spec and spec.loader
+        spec.loader.exec_module(module)  # type: ignore[attr-defined]
+        ObsidianAutoSaver = getattr(module, 'ObsidianAutoSaver', None)
+
+    # Fallback to package import if available
+    if ObsidianAutoSaver is None:
+        try:
+            from src.Obsidian_Integration.obsidian_auto_saver import ObsidianAutoSaver as PkgSaver  # type: ignore
+            ObsidianAutoSaver = PkgSaver
+        except Exception:
+            pass
+
+    if ObsidianAutoSaver is None:
+        raise ImportError("Could not import ObsidianAutoSaver. Ensure obsidian_auto_saver.py exists.")
+
+    return ObsidianAutoSaver
+
+
+@dataclass(slots=True)
+class Decision:
+    """One operator decision in the session audit trail"""
+    stage: str
+    ts_ns: int
+    operator: Optional[str]
+    decision: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Log entry as saved, with the timestamp formatted"""
+        return {
+            'stage': self.stage,
+            'timestamp': _ns_to_iso(self.ts_ns),
+            'operator': self.operator,
+            'decision': self.decision
+        }
+
+
+@dataclass(slots=True)
+class SessionData:
+    """Operator session state collected by the interactive interface"""
+    operator_name: Optional[str] = None
+    company_name: Optional[str] = None
+    session_start: datetime = field(default_factory=datetime.now)
+    decisions_made: List[Decision] = field(default_factory=list)
+
+
 class InteractiveOperatorInterface:
     """Enhanced operator interface for collecting real inputs with validation"""
     
-    def __init__(self, obsidian_vault_path: str = None):
-        self.session_data = {
-            'operator_name': None,
-            'company_name': None,
-            'session_start': datetime.now(),
-            'decisions_made': []
-        }
-        # Initialize Obsidian saver (robust import regardless of folder name/spacing)
-        self.obsidian_saver = self._init_obsidian_saver(obsidian_vault_path)
+    def __init__(self, obsidian_vault_path: str = None, interactive: bool = True):
+        self.session_data = SessionData()
+        # Fail at startup if the saver is missing; the saver itself is created on first use
+        # (see obsidian_saver), and the class lookup is cached for that later call
+        _load_obsidian_saver_cls()
+        self._vault_path = obsidian_vault_path
+        # When False, "Press Enter" pauses are skipped (scripted and batch runs)
+        self.interactive = interactive
+        # Only clear real terminals; piped/logged output should stay free of escape codes
+        self._stdout_is_tty = sys.stdout.isatty()
+        if self._stdout_is_tty:
+            _enable_windows_ansi()
         self.clear_screen()
 
-    def _init_obsidian_saver(self, vault_path: Optional[str]):
-        """Import and construct ObsidianAutoSaver even if folder has spaces."""
-        # Try loading from file path: src/Obsidian Integration/obsidian_auto_saver.py
-        this_dir = Path(__file__).resolve().parents[1]
-        spaced_dir = this_dir / 'Obsidian Integration'
-        underscored_dir = this_dir / 'Obsidian_Integration'
-        candidate_file = None
-        if (spaced_dir / 'obsidian_auto_saver.py').exists():
-            candidate_file = spaced_dir / 'obsidian_auto_saver.py'
-        elif (underscored_dir / 'obsidian_auto_saver.py').exists():
-            candidate_file = underscored_dir / 'obsidian_auto_saver.py'
-
-        ObsidianAutoSaver = None
-        if candidate_file is not None:
-            spec = importlib.util.spec_from_file_location('obsidian_auto_saver', str(candidate_file))
-            module = importlib.util.module_from_spec(spec)
-            assert spec and spec.loader
-            spec.loader.exec_module(module)  # type: ignore[attr-defined]
-            ObsidianAutoSaver = getattr(module, 'ObsidianAutoSaver', None)
-
-        # Fallback to package import if available
-        if ObsidianAutoSaver is None:
-            try:
-                from src.Obsidian_Integration.obsidian_auto_saver import ObsidianAutoSaver as PkgSaver  # type: ignore
-                ObsidianAutoSaver = PkgSaver
-            except Exception:
-                pass
-
-        if ObsidianAutoSaver is None:
-            raise ImportError("Could not import ObsidianAutoSaver. Ensure obsidian_auto_saver.py exists.")
-
-        return ObsidianAutoSaver(vault_path)
+    @functools.cached_property
+    def obsidian_saver(self):
+        """ObsidianAutoSaver for this session, built the first time results are saved"""
+        return _load_obsidian_saver_cls()(self._vault_path)
+    
+    @functools.cached_property
+    def session_id(self) -> str:
+        """SIM_<yyyymmdd_hhmmss> id for this session, formatted once from its start time"""
+        return f"SIM_{self.session_data.session_start.strftime('%Y%m%d_%H%M%S')}"
+    
+    def pause(self, message: str):
+        """Wait for Enter, unless running non-interactively"""
+        if self.interactive:
+            _ask(message)
     
     def clear_screen(self):
         """Clear the terminal screen for better UX"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        if self._stdout_is_tty:
+            print(_CLEAR_SCREEN, end="", flush=True)
     
     def start_session(self):
         """Initialize operator session with company details"""
-        print("🏭 INTERACTIVE SUPPLY CHAIN SIMULATION SYSTEM")
-        print("=" * 60)
-        print("Welcome to the Supply Chain Reconstruction Platform!")
-        print("This system will guide you through setting up and running")
-        print("a complete supply chain simulation from raw materials to customers.")
-        print()
+        sys.stdout.write(_WELCOME_BANNER)
         
         # Get operator and company information
-        self.session_data['operator_name'] = input("👤 Enter your name: ").strip()
-        self.session_data['company_name'] = input("🏢 Enter your company name: ").strip()
+        self.session_data.operator_name = _ask("👤 Enter your name: ").strip()
+        self.session_data.company_name = _ask("🏢 Enter your company name: ").strip()
         
-        if not self.session_data['operator_name']:
-            self.session_data['operator_name'] = "Supply Chain Operator"
-        if not self.session_data['company_name']:
-            self.session_data['company_name'] = "Industrial Company"
+        if not self.session_data.operator_name:
+            self.session_data.operator_name = "Supply Chain Operator"
+        if not self.session_data.company_name:
+            self.session_data.company_name = "Industrial Company"
         
-        print(f"\nWelcome, {self.session_data['operator_name']} from {self.session_data['company_name']}!")
-        print("You will make key decisions at each stage of the supply chain.")
-        input("\nPress Enter to begin the simulation setup...")
+        sys.stdout.write(
+            f"\nWelcome, {self.session_data.operator_name} from {self.session_data.company_name}!\n"
+            "You will make key decisions at each stage of the supply chain.\n"
+        )
+        self.pause("\nPress Enter to begin the simulation setup...")
         self.clear_screen()
     
     def get_simulation_overview_inputs(self) -> Dict[str, Any]:
         """Get high-level simulation parameters"""
-        print("📊 SIMULATION OVERVIEW SETUP")
-        print("=" * 40)
+        sys.stdout.write(_OVERVIEW_HEADER)
         
         # Simulation scope
         print("What type of supply chain simulation would you like to run?")
-        simulation_types = [
-            "Mining to Manufacturing (Phosphate/Fertilizer)",
-            "Mining to Steel Production", 
-            "Full End-to-End (Mining to Customer)",
-            "Custom Supply Chain"
-        ]
-        
-        sim_type = self._get_choice("Select simulation type", simulation_types)
+        sim_type = self._get_choice("Select simulation type", SIMULATION_TYPES)
         
         # Time horizon
-        time_horizons = ["1 Month", "3 Months", "6 Months", "1 Year", "Custom"]
-        time_horizon = self._get_choice("Select simulation time horizon", time_horizons)
+        time_horizon = self._get_choice("Select simulation time horizon", TIME_HORIZONS)
         
         if time_horizon == "Custom":
             custom_months = self._get_float_input("Enter simulation duration in months", min_val=1, max_val=60, default=6)
@@ -125,15 +416,14 @@ class InteractiveOperatorInterface:
         
         # Geographic scope
         print("\nWhere is your supply chain operation located?")
-        regions = ["Middle East (Saudi Arabia/UAE)", "North America", "Europe", "Asia Pacific", "South America", "Other"]
-        region = self._get_choice("Select primary region", regions)
+        region = self._get_choice("Select primary region", OPERATING_REGIONS)
         
         overview = {
             'simulation_type': sim_type,
             'time_horizon': time_horizon,
             'primary_region': region,
-            'company_name': self.session_data['company_name'],
-            'operator_name': self.session_data['operator_name']
+            'company_name': self.session_data.company_name,
+            'operator_name': self.session_data.operator_name
         }
         
         self._log_decision('simulation_overview', overview)
@@ -141,33 +431,22 @@ class InteractiveOperatorInterface:
     
     def get_mining_facility_setup(self) -> Dict[str, Any]:
         """Get detailed mining facility configuration"""
-        print("\n⛏️  MINING FACILITY CONFIGURATION")
-        print("=" * 40)
+        sys.stdout.write(_MINING_HEADER)
         
         # Mining facility details
-        facility_name = input("Enter mining facility name (e.g., 'Al-Kharsaah Mine'): ").strip()
+        facility_name = _ask("Enter mining facility name (e.g., 'Al-Kharsaah Mine'): ").strip()
         if not facility_name:
-            facility_name = f"{self.session_data['company_name']} Mine"
+            facility_name = f"{self.session_data.company_name} Mine"
         
-        location = input("Enter mine location (e.g., 'Northern Province, Saudi Arabia'): ").strip()
+        location = _ask("Enter mine location (e.g., 'Northern Province, Saudi Arabia'): ").strip()
         if not location:
             location = "Industrial Zone"
         
         # Ore selection with descriptions
         print("\nSelect the primary ore/mineral you extract:")
-        ore_options = [
-            ("Phosphorite Ore", "For fertilizer production (P2O5 content)"),
-            ("Iron Ore", "For steel and metal production"),  
-            ("Bauxite", "For aluminum production"),
-            ("Copper Ore", "For copper and electrical applications"),
-            ("Gold Ore", "Precious metal extraction"),
-            ("Limestone", "For cement and construction materials")
-        ]
-        
-        for i, (ore, desc) in enumerate(ore_options, 1):
-            print(f"  {i}. {ore} - {desc}")
+        sys.stdout.write(ORE_MENU + "\n")
         
-        ore_choice = self._get_indexed_choice("Select ore type", [ore for ore, _ in ore_options])
+        ore_choice = self._get_indexed_choice("Select ore type", [ore for ore, _ in ORE_OPTIONS])
         
         # Mining capacity and rates
         print(f"\nConfiguring extraction parameters for {ore_choice}:")
@@ -201,14 +480,20 @@ class InteractiveOperatorInterface:
         )
         
         # Equipment configuration
+        # One line of status codes for all units instead of a menu per unit
         print(f"\nMining equipment status:")
-        equipment_status = {}
-        equipment_types = ["Drilling Equipment", "Excavation Equipment", "Transport Equipment", "Crushing Equipment"]
+        print("Status codes: O=Operational, M=Maintenance Required, R=Under Repair")
+        codes = _ask(_EQUIPMENT_STATUS_PROMPT).strip().upper() or 'O' * len(EQUIPMENT_TYPES)
         
-        for equipment in equipment_types:
-            status_options = ["Operational", "Maintenance Required", "Under Repair"]
-            status = self._get_choice(f"{equipment} status", status_options, default="Operational")
-            equipment_status[equipment] = status
+        if len(codes) == len(EQUIPMENT_TYPES) and set(codes) <= EQUIPMENT_STATUS_CODES.keys():
+            equipment_status = {equipment: EQUIPMENT_STATUS_CODES[code] for equipment, code in zip(EQUIPMENT_TYPES, codes)}
+        else:
+            print("❌ Unrecognized status codes, please set each unit individually")
+            equipment_status = {}
+            status_options = list(EQUIPMENT_STATUS_CODES.values())
+            for equipment in EQUIPMENT_TYPES:
+                status = self._get_choice(f"{equipment} status", status_options, default="Operational")
+                equipment_status[equipment] = status
         
         mining_config = {
             'facility_name': facility_name,
@@ -227,37 +512,29 @@ class InteractiveOperatorInterface:
     
     def get_processing_facility_setup(self) -> Dict[str, Any]:
         """Get processing facility configuration"""
-        print("\n⚗️  PROCESSING FACILITY CONFIGURATION")
-        print("=" * 40)
+        sys.stdout.write(_PROCESSING_HEADER)
         
         # Processing facility details
-        facility_name = input("Enter processing facility name (e.g., 'Jubail Processing Complex'): ").strip()
+        facility_name = _ask("Enter processing facility name (e.g., 'Jubail Processing Complex'): ").strip()
         if not facility_name:
-            facility_name = f"{self.session_data['company_name']} Processing Plant"
+            facility_name = f"{self.session_data.company_name} Processing Plant"
         
         # Processing methods based on ore type
         print("Select available processing methods:")
-        methods = [
-            "Chemical Processing (Acid treatment, beneficiation)",
-            "Physical Processing (Crushing, grinding, separation)", 
-            "Thermal Processing (Smelting, roasting)",
-            "Beneficiation (Flotation, magnetic separation)",
-            "Hydrometallurgy (Leaching, extraction)"
-        ]
+        methods = PROCESSING_METHODS
         
         selected_methods = []
-        for i, method in enumerate(methods, 1):
-            print(f"  {i}. {method}")
+        sys.stdout.write(PROCESSING_METHOD_MENU + "\n")
         
         print("Select multiple methods (enter numbers separated by commas, e.g., '1,2,4'):")
-        method_input = input("Enter method numbers: ").strip()
+        method_input = _ask("Enter method numbers: ").strip()
         
         if method_input:
-            try:
-                method_indices = [int(x.strip()) - 1 for x in method_input.split(',')]
-                selected_methods = [methods[i] for i in method_indices if 0 <= i < len(methods)]
-            except:
+            method_indices = _parse_csv_indices(method_input)
+            if method_indices is None:
                 selected_methods = [methods[0]]  # Default to first method
+            else:
+                selected_methods = [methods[i] for i in method_indices if 0 <= i < len(methods)]
         
         if not selected_methods:
             selected_methods = [methods[0]]
@@ -300,33 +577,21 @@ class InteractiveOperatorInterface:
     
     def get_manufacturing_facility_setup(self) -> Dict[str, Any]:
         """Get manufacturing facility configuration"""
-        print("\n🏭 MANUFACTURING FACILITY CONFIGURATION")
-        print("=" * 40)
+        sys.stdout.write(_MANUFACTURING_HEADER)
         
         # Manufacturing facility details
-        facility_name = input("Enter manufacturing facility name (e.g., 'Industrial Manufacturing Complex'): ").strip()
+        facility_name = _ask("Enter manufacturing facility name (e.g., 'Industrial Manufacturing Complex'): ").strip()
         if not facility_name:
-            facility_name = f"{self.session_data['company_name']} Manufacturing Plant"
+            facility_name = f"{self.session_data.company_name} Manufacturing Plant"
         
         # Product selection
         print("Select products to manufacture:")
-        product_options = [
-            ("DAP Fertilizer", "Di-Ammonium Phosphate fertilizer"),
-            ("TSP Fertilizer", "Triple Super Phosphate fertilizer"),
-            ("MAP Fertilizer", "Mono-Ammonium Phosphate fertilizer"), 
-            ("NPK Compound", "Nitrogen-Phosphorus-Potassium compound"),
-            ("Steel Products", "Steel beams, rebar, structural steel"),
-            ("Industrial Chemicals", "Phosphoric acid, sulfuric acid"),
-            ("Custom Product", "Specify your own product")
-        ]
-        
-        for i, (product, desc) in enumerate(product_options, 1):
-            print(f"  {i}. {product} - {desc}")
+        sys.stdout.write(PRODUCT_MENU + "\n")
         
-        product_choice = self._get_indexed_choice("Select primary product", [p for p, _ in product_options])
+        product_choice = self._get_indexed_choice("Select primary product", [p for p, _ in PRODUCT_OPTIONS])
         
         if product_choice == "Custom Product":
-            custom_product = input("Enter your custom product name: ").strip()
+            custom_product = _ask("Enter your custom product name: ").strip()
             if custom_product:
                 product_choice = custom_product
         
@@ -340,11 +605,7 @@ class InteractiveOperatorInterface:
             "Blending and Mixing Line"
         ]
         
-        selected_lines = []
-        for i, line in enumerate(line_types, 1):
-            use_line = input(f"Include {line}? (y/n) [y]: ").strip().lower()
-            if use_line in ['', 'y', 'yes']:
-                selected_lines.append(line)
+        selected_lines = self._multi_toggle("Lines to include", line_types)
         
         if not selected_lines:
             selected_lines = [line_types[0]]  # At least one line
@@ -356,8 +617,7 @@ class InteractiveOperatorInterface:
         )
         
         # Quality standards
-        quality_standards = ["Export Grade", "Premium", "Standard", "Industrial Grade"]
-        quality_standard = self._get_choice("Default quality standard", quality_standards)
+        quality_standard = self._get_choice("Default quality standard", QUALITY_STANDARDS)
         
         # Production efficiency
         efficiency = self._get_float_input(
@@ -379,15 +639,14 @@ class InteractiveOperatorInterface:
     
     def get_distribution_center_setup(self) -> Dict[str, Any]:
         """Get comprehensive distribution center configuration"""
-        print("\n📦 DISTRIBUTION CENTER CONFIGURATION")
-        print("=" * 40)
+        sys.stdout.write(_DISTRIBUTION_HEADER)
         
         # Distribution center details
-        center_name = input("Enter distribution center name (e.g., 'Jubail Export Terminal'): ").strip()
+        center_name = _ask("Enter distribution center name (e.g., 'Jubail Export Terminal'): ").strip()
         if not center_name:
-            center_name = f"{self.session_data['company_name']} Distribution Center"
+            center_name = f"{self.session_data.company_name} Distribution Center"
         
-        location = input("Enter distribution center location (e.g., 'Jubail Industrial City, Saudi Arabia'): ").strip()
+        location = _ask("Enter distribution center location (e.g., 'Jubail Industrial City, Saudi Arabia'): ").strip()
         if not location:
             location = "Industrial Port"
         
@@ -401,33 +660,20 @@ class InteractiveOperatorInterface:
         print(f"\nConfigure export destinations:")
         print("Select countries/regions you export to:")
         
-        country_regions = {
-            "Asia Pacific": ["China", "India", "Japan", "South Korea", "Australia", "Singapore"],
-            "Europe": ["Germany", "France", "Netherlands", "Turkey", "UK", "Italy"],
-            "Americas": ["USA", "Brazil", "Argentina", "Mexico", "Canada"],
-            "Africa": ["Morocco", "Egypt", "South Africa", "Nigeria", "Kenya"],
-            "Middle East": ["UAE", "Iraq", "Kuwait", "Jordan", "Qatar"]
-        }
-        
         selected_destinations = {}
         
-        for region, countries in country_regions.items():
-            print(f"\n{region}:")
-            for i, country in enumerate(countries, 1):
-                print(f"  {i}. {country}")
+        for region, countries, region_menu in EXPORT_COUNTRY_REGIONS:
+            sys.stdout.write(region_menu)
             
-            export_to_region = input(f"Export to {region}? (y/n): ").strip().lower()
+            export_to_region = _ask(f"Export to {region}? (y/n): ").strip().lower()
             if export_to_region in ['y', 'yes']:
-                country_input = input(f"Enter country numbers for {region} (comma-separated, e.g., 1,3,4): ").strip()
+                country_input = _ask(f"Enter country numbers for {region} (comma-separated, e.g., 1,3,4): ").strip()
                 
-                if country_input:
-                    try:
-                        country_indices = [int(x.strip()) - 1 for x in country_input.split(',')]
-                        selected_countries = [countries[i] for i in country_indices if 0 <= i < len(countries)]
-                        if selected_countries:
-                            selected_destinations[region] = selected_countries
-                    except:
-                        pass
+                country_indices = _parse_csv_indices(country_input) if country_input else None
+                if country_indices is not None:
+                    selected_countries = [countries[i] for i in country_indices if 0 <= i < len(countries)]
+                    if selected_countries:
+                        selected_destinations[region] = selected_countries
         
         # Default destinations if none selected
         if not selected_destinations:
@@ -443,23 +689,15 @@ class InteractiveOperatorInterface:
             "Pipeline Transport"
         ]
         
-        selected_shipping = []
-        for i, method in enumerate(shipping_methods, 1):
-            use_method = input(f"Use {method}? (y/n) [y]: ").strip().lower()
-            if use_method in ['', 'y', 'yes']:
-                selected_shipping.append(method)
+        selected_shipping = self._multi_toggle("Methods to use", shipping_methods)
         
         if not selected_shipping:
             selected_shipping = [shipping_methods[0]]
         
         # Port/terminal facilities
-        port_facilities = []
+        print(f"\nPort/terminal facilities:")
         facility_types = ["Loading Berths", "Bulk Handling Equipment", "Container Terminals", "Rail Connections"]
-        
-        for facility in facility_types:
-            has_facility = input(f"Have {facility}? (y/n) [y]: ").strip().lower()
-            if has_facility in ['', 'y', 'yes']:
-                port_facilities.append(facility)
+        port_facilities = self._multi_toggle("Facilities available", facility_types)
         
         distribution_config = {
             'center_name': center_name,
@@ -475,13 +713,12 @@ class InteractiveOperatorInterface:
     
     def get_sales_organization_setup(self) -> Dict[str, Any]:
         """Get sales and customer management configuration"""
-        print("\n🛒 SALES ORGANIZATION CONFIGURATION")
-        print("=" * 40)
+        sys.stdout.write(_SALES_HEADER)
         
         # Sales organization details
-        org_name = input("Enter sales organization name (e.g., 'International Sales Division'): ").strip()
+        org_name = _ask("Enter sales organization name (e.g., 'International Sales Division'): ").strip()
         if not org_name:
-            org_name = f"{self.session_data['company_name']} Sales"
+            org_name = f"{self.session_data.company_name} Sales"
         
         # Sales channels
         print(f"\nSelect sales channels:")
@@ -495,11 +732,7 @@ class InteractiveOperatorInterface:
             "Direct Customer Sales"
         ]
         
-        selected_channels = []
-        for i, channel in enumerate(channels, 1):
-            use_channel = input(f"Use {channel}? (y/n) [y]: ").strip().lower()
-            if use_channel in ['', 'y', 'yes']:
-                selected_channels.append(channel)
+        selected_channels = self._multi_toggle("Channels to use", channels)
         
         if not selected_channels:
             selected_channels = [channels[0]]
@@ -515,24 +748,13 @@ class InteractiveOperatorInterface:
             "Construction Companies"
         ]
         
-        target_customers = []
-        for i, customer in enumerate(customer_types, 1):
-            target = input(f"Target {customer}? (y/n) [y]: ").strip().lower()
-            if target in ['', 'y', 'yes']:
-                target_customers.append(customer)
+        target_customers = self._multi_toggle("Customer types to target", customer_types)
         
         if not target_customers:
             target_customers = [customer_types[0]]
         
         # Pricing strategy
-        pricing_strategies = [
-            "Market Rate Pricing",
-            "Competitive Pricing", 
-            "Premium Pricing",
-            "Cost-Plus Pricing",
-            "Contract-Based Pricing"
-        ]
-        pricing_strategy = self._get_choice("Select primary pricing strategy", pricing_strategies)
+        pricing_strategy = self._get_choice("Select primary pricing strategy", PRICING_STRATEGIES)
         
         # Sales targets
         monthly_target = self._get_float_input(
@@ -546,8 +768,7 @@ class InteractiveOperatorInterface:
         )
         
         # Payment terms
-        payment_terms = ["Cash in Advance", "Letter of Credit", "Open Account", "Documentary Collection"]
-        preferred_payment = self._get_choice("Preferred payment terms", payment_terms)
+        preferred_payment = self._get_choice("Preferred payment terms", PAYMENT_TERMS)
         
         sales_config = {
             'organization_name': org_name,
@@ -564,36 +785,32 @@ class InteractiveOperatorInterface:
     
     def get_operational_decisions(self, stage: str, request: Dict) -> Dict[str, Any]:
         """Get real-time operational decisions during simulation"""
-        print(f"\n🎯 OPERATIONAL DECISION REQUIRED - {stage.upper()}")
-        print("=" * 50)
-        print(f"Request ID: {request.get('request_id', 'N/A')}")
-        print(f"Stage: {stage}")
-        print(f"Context: {request.get('operation', 'Processing required')}")
-        print()
+        sys.stdout.write(
+            f"\n🎯 OPERATIONAL DECISION REQUIRED - {stage.upper()}\n"
+            f"{'=' * 50}\n"
+            f"Request ID: {request.get('request_id', 'N/A')}\n"
+            f"Stage: {stage}\n"
+            f"Context: {request.get('operation', 'Processing required')}\n"
+            "\n"
+        )
         
-        decisions = {}
+        collect_decisions = self._STAGE_DISPATCH.get(stage)
         
-        if stage == 'processing':
-            decisions = self._get_processing_operational_decisions(request)
-        elif stage == 'manufacturing':
-            decisions = self._get_manufacturing_operational_decisions(request)
-        elif stage == 'distribution':
-            decisions = self._get_distribution_operational_decisions(request)
-        elif stage == 'retail':
-            decisions = self._get_retail_operational_decisions(request)
-        
-        # Confirmation
-        print(f"\n📋 DECISION SUMMARY:")
-        for key, value in decisions.items():
-            print(f"  {key}: {value}")
-        
-        confirm = input(f"\nConfirm these decisions? (y/n) [y]: ").strip().lower()
-        if confirm in ['', 'y', 'yes']:
-            self._log_decision(f'{stage}_operational', decisions)
-            return decisions
-        else:
+        # Re-collect until the operator confirms
+        while True:
+            decisions = collect_decisions(self, request) if collect_decisions else {}
+            
+            # Confirmation
+            print(f"\n📋 DECISION SUMMARY:")
+            for key, value in decisions.items():
+                print(f"  {key}: {value}")
+            
+            confirm = _ask(f"\nConfirm these decisions? (y/n) [y]: ").strip().lower()
+            if confirm in ['', 'y', 'yes']:
+                self._log_decision(f'{stage}_operational', decisions)
+                return decisions
+            
             print("Decision cancelled. Please restart this decision point.")
-            return self.get_operational_decisions(stage, request)
     
     def _get_processing_operational_decisions(self, request: Dict) -> Dict[str, Any]:
         """Get processing operational decisions"""
@@ -608,8 +825,7 @@ class InteractiveOperatorInterface:
         decisions = {}
         
         # Processing recipe
-        recipes = ["Standard Processing", "High Quality Processing", "Fast Processing", "Efficient Processing"]
-        decisions['processing_recipe'] = self._get_choice("Select processing method", recipes)
+        decisions['processing_recipe'] = self._get_choice("Select processing method", PROCESSING_RECIPES)
         
         # Quality target
         decisions['quality_target'] = self._get_float_input(
@@ -625,8 +841,7 @@ class InteractiveOperatorInterface:
         )
         
         # Priority
-        priorities = ["Urgent", "Normal", "Batch Optimize"]
-        decisions['priority'] = self._get_choice("Processing priority", priorities, default="Normal")
+        decisions['priority'] = self._get_choice("Processing priority", PROCESSING_PRIORITIES, default="Normal")
         
         return decisions
     
@@ -638,16 +853,13 @@ class InteractiveOperatorInterface:
         decisions = {}
         
         # Product selection
-        products = ["DAP Fertilizer", "TSP Fertilizer", "NPK Compound", "Industrial Grade"]
-        decisions['product_type'] = self._get_choice("Select product to manufacture", products)
+        decisions['product_type'] = self._get_choice("Select product to manufacture", MANUFACTURED_PRODUCTS)
         
         # Quality standard
-        quality_levels = ["Export Grade", "Premium", "Standard", "Industrial"]
-        decisions['quality_standard'] = self._get_choice("Select quality standard", quality_levels)
+        decisions['quality_standard'] = self._get_choice("Select quality standard", QUALITY_LEVELS)
         
         # Production rate
-        production_rates = ["Maximum", "Optimal", "Conservative"]
-        decisions['production_rate'] = self._get_choice("Select production rate", production_rates, default="Optimal")
+        decisions['production_rate'] = self._get_choice("Select production rate", PRODUCTION_RATES, default="Optimal")
         
         # Batch size
         decisions['batch_size'] = self._get_float_input(
@@ -656,8 +868,7 @@ class InteractiveOperatorInterface:
         )
         
         # Packaging
-        packaging_options = ["Bulk", "50kg Bags", "1000kg Bags", "Custom Packaging"]
-        decisions['packaging'] = self._get_choice("Select packaging type", packaging_options)
+        decisions['packaging'] = self._get_choice("Select packaging type", PACKAGING_OPTIONS)
         
         return decisions
     
@@ -669,16 +880,13 @@ class InteractiveOperatorInterface:
         decisions = {}
         
         # Select destination from configured ones
-        available_destinations = ["China", "India", "Brazil", "Germany", "UAE"]
-        decisions['destination_country'] = self._get_choice("Select export destination", available_destinations)
+        decisions['destination_country'] = self._get_choice("Select export destination", EXPORT_DESTINATIONS)
         
         # Shipping method
-        shipping_methods = ["Bulk Carrier", "Container Ship", "Combined Transport"]
-        decisions['shipping_method'] = self._get_choice("Select shipping method", shipping_methods)
+        decisions['shipping_method'] = self._get_choice("Select shipping method", SHIPPING_METHODS)
         
         # Delivery schedule
-        schedules = ["Immediate", "Scheduled", "Seasonal Optimal", "Cost Optimal"]
-        decisions['delivery_schedule'] = self._get_choice("Select delivery schedule", schedules, default="Scheduled")
+        decisions['delivery_schedule'] = self._get_choice("Select delivery schedule", DELIVERY_SCHEDULES, default="Scheduled")
         
         # Allocation percentage
         decisions['allocation_percent'] = self._get_float_input(
@@ -696,20 +904,16 @@ class InteractiveOperatorInterface:
         decisions = {}
         
         # Customer type
-        customer_types = ["Agricultural Coop", "Industrial Manufacturer", "Trading Company", "Government Agency"]
-        decisions['customer_type'] = self._get_choice("Select customer type", customer_types)
+        decisions['customer_type'] = self._get_choice("Select customer type", CUSTOMER_TYPES)
         
         # Pricing approach
-        pricing_approaches = ["Market Rate", "Competitive Price", "Premium Price", "Contract Price"]
-        decisions['pricing_approach'] = self._get_choice("Select pricing approach", pricing_approaches)
+        decisions['pricing_approach'] = self._get_choice("Select pricing approach", PRICING_APPROACHES)
         
         # Sales channel
-        channels = ["Bulk Export", "Container Export", "Domestic Sales", "Spot Market"]
-        decisions['sales_channel'] = self._get_choice("Select sales channel", channels)
+        decisions['sales_channel'] = self._get_choice("Select sales channel", SALES_CHANNELS)
         
         # Payment terms
-        payment_terms = ["Cash Advance", "Letter of Credit", "Open Account", "Documentary Collection"]
-        decisions['payment_terms'] = self._get_choice("Select payment terms", payment_terms, default="Letter of Credit")
+        decisions['payment_terms'] = self._get_choice("Select payment terms", SALES_PAYMENT_TERMS, default="Letter of Credit")
         
         # Sales quantity
         decisions['sales_quantity'] = self._get_float_input(
@@ -719,20 +923,34 @@ class InteractiveOperatorInterface:
         
         return decisions
     
-    def _get_choice(self, prompt: str, options: List[str], default: str = None) -> str:
+    # Stage -> decision collector used by get_operational_decisions
+    _STAGE_DISPATCH: ClassVar[Dict[str, Any]] = {
+        'processing': _get_processing_operational_decisions,
+        'manufacturing': _get_manufacturing_operational_decisions,
+        'distribution': _get_distribution_operational_decisions,
+        'retail': _get_retail_operational_decisions
+    }
+    
+    def _get_choice(self, prompt: str, options: Sequence[str], default: str = None) -> str:
         """Get a choice from operator with validation"""
+        options = tuple(options)
+        index = _choice_index(options)
+        menu = f"\n{prompt}:\n{_choice_menu(options, default)}\n"
+        if default:
+            prompt_line = f"Enter choice (1-{len(options)}) or press Enter for default: "
+        else:
+            prompt_line = f"Enter choice (1-{len(options)}): "
+        
+        # The menu is shown once; a retry only repeats the short prompt line
+        sys.stdout.write(menu)
         while True:
-            print(f"\n{prompt}:")
-            for i, option in enumerate(options, 1):
-                marker = " (default)" if option == default else ""
-                print(f"  {i}. {option}{marker}")
+            choice_input = _ask(prompt_line).strip()
+            if not choice_input and default:
+                return default
             
-            if default:
-                choice_input = input(f"Enter choice (1-{len(options)}) or press Enter for default: ").strip()
-                if not choice_input and default:
-                    return default
-            else:
-                choice_input = input(f"Enter choice (1-{len(options)}): ").strip()
+            choice = index.get(choice_input.lower())
+            if choice is not None:
+                return choice
             
             try:
                 choice_num = int(choice_input)
@@ -743,70 +961,87 @@ class InteractiveOperatorInterface:
             except ValueError:
                 print("❌ Please enter a valid number")
     
-    def _get_indexed_choice(self, prompt: str, options: List[str]) -> str:
+    def _get_indexed_choice(self, prompt: str, options: Sequence[str]) -> str:
         """Get indexed choice (simplified version of _get_choice)"""
         return self._get_choice(prompt, options)
     
-    def _get_float_input(self, prompt: str, min_val: float = None, max_val: float = None, default: float = None) -> float:
-        """Get float input from operator with validation"""
+    def _multi_toggle(self, label: str, items: Sequence[str], default_all: bool = True) -> List[str]:
+        """Select any number of items from one numbered menu ('all', 'none' or e.g. '1,3')"""
+        sys.stdout.write(_choice_menu(tuple(items), None) + "\n")
+        default_answer = 'all' if default_all else 'none'
+        
         while True:
-            range_info = ""
-            if min_val is not None and max_val is not None:
-                range_info = f" ({min_val:,.0f}-{max_val:,.0f})"
-            elif min_val is not None:
-                range_info = f" (min: {min_val:,.0f})"
-            elif max_val is not None:
-                range_info = f" (max: {max_val:,.0f})"
+            answer = _ask(f"{label} (e.g. 1,3), 'all' or 'none' [{default_answer}]: ").strip().lower() or default_answer
+            if answer == 'all':
+                return list(items)
+            if answer == 'none':
+                return []
             
-            default_info = f" [default: {default:,.0f}]" if default is not None else ""
-            
-            user_input = input(f"{prompt}{range_info}{default_info}: ").strip()
+            indices = _parse_csv_indices(answer)
+            if indices is None:
+                print("❌ Please enter numbers separated by commas, 'all' or 'none'")
+            elif all(0 <= i < len(items) for i in indices):
+                chosen = set(indices)
+                return [item for i, item in enumerate(items) if i in chosen]
+            else:
+                print(f"❌ Please enter numbers between 1 and {len(items)}")
+    
+    def _get_float_input(self, prompt: str, min_val: float = None, max_val: float = None, default: float = None,
+                         clamp: bool = False) -> float:
+        """Get float input from operator with validation (clamp=True limits to range instead of re-asking)"""
+        range_info = ""
+        if min_val is not None and max_val is not None:
+            range_info = f" ({min_val:,.0f}-{max_val:,.0f})"
+        elif min_val is not None:
+            range_info = f" (min: {min_val:,.0f})"
+        elif max_val is not None:
+            range_info = f" (max: {max_val:,.0f})"
+        
+        default_info = f" [default: {default:,.0f}]" if default is not None else ""
+        full_prompt = f"{prompt}{range_info}{default_info}: "
+        
+        while True:
+            user_input = _ask(full_prompt).strip()
             
             if not user_input and default is not None:
                 return default
             
             try:
                 value = float(user_input)
-                
-                if min_val is not None and value < min_val:
-                    print(f"❌ Value must be at least {min_val:,.0f}")
-                    continue
-                
-                if max_val is not None and value > max_val:
-                    print(f"❌ Value must be at most {max_val:,.0f}")
-                    continue
-                
-                return value
-                
             except ValueError:
                 print("❌ Please enter a valid number")
+                continue
+            
+            if clamp:
+                return _clamp(value, min_val, max_val)
+            
+            error = _range_error(value, min_val, max_val)
+            if error is None:
+                return value
+            print(error)
     
     def _log_decision(self, stage: str, decision: Dict):
         """Log operator decision for audit trail"""
-        log_entry = {
-            'stage': stage,
-            'timestamp': datetime.now(),
-            'operator': self.session_data['operator_name'],
-            'decision': decision
-        }
-        self.session_data['decisions_made'].append(log_entry)
+        self.session_data.decisions_made.append(
+            Decision(stage, time.time_ns(), self.session_data.operator_name, decision)
+        )
     
     def save_session_log(self, filename: str = None):
         """Save session directly to Obsidian vault only"""
         # Convert session data to simulation results format for Obsidian
         simulation_results = {
-            'simulation_id': f"SIM_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            'start_time': self.session_data['session_start'],
+            'simulation_id': self.session_id,
+            'start_time': self.session_data.session_start,
             'end_time': datetime.now(),
-            'duration': str(datetime.now() - self.session_data['session_start']),
+            'duration': str(datetime.now() - self.session_data.session_start),
             'simulation_config': {
                 'overview': {
-                    'company_name': self.session_data['company_name'],
-                    'operator_name': self.session_data['operator_name'],
+                    'company_name': self.session_data.company_name,
+                    'operator_name': self.session_data.operator_name,
                     'simulation_type': 'Interactive Configuration'
                 }
             },
-            'operator_decisions': self.session_data['decisions_made'],
+            'operator_decisions': [d.to_dict() for d in self.session_data.decisions_made],
             'final_metrics': {},
             'material_flow': [],
             'stages': {}
@@ -826,9 +1061,10 @@ class EnhancedSupplyChainSimulator:
     Enhanced supply chain simulation system with complete operator interaction
     """
     
-    def __init__(self, obsidian_vault_path: str = None):
+    def __init__(self, obsidian_vault_path: str = None, interactive: bool = True):
         """Initialize the enhanced simulation system"""
-        self.operator_interface = InteractiveOperatorInterface(obsidian_vault_path)
+        self.interactive = interactive
+        self.operator_interface = InteractiveOperatorInterface(obsidian_vault_path, interactive)
         self.simulation_config = {}
         self.agents = {}
         self.material_traces = {}
@@ -837,38 +1073,70 @@ class EnhancedSupplyChainSimulator:
         
         logger.info("Enhanced Supply Chain Simulator initialized")
     
+    @property
+    def batch_output(self) -> bool:
+        """True for non-interactive runs whose stdout is a file or pipe"""
+        return not (self.interactive or self.operator_interface._stdout_is_tty)
+    
     def run_interactive_simulation(self) -> Dict:
         """
         Run complete interactive simulation with operator inputs at each stage
-        """
-        print("🚀 STARTING INTERACTIVE SUPPLY CHAIN SIMULATION")
-        print("=" * 60)
-        
-        # Start operator session
-        self.operator_interface.start_session()
-        
-        # Phase 1: Get simulation overview
-        overview = self.operator_interface.get_simulation_overview_inputs()
-        self.simulation_config['overview'] = overview
-        
-        # Phase 2: Configure all facilities
-        self._configure_all_facilities()
         
-        # Phase 3: Initialize agents with operator configurations
-        self._initialize_agents_from_config()
+        Batch runs (see batch_output) keep stdout for the one-line JSON summary;
+        the prompts, stage reports and vault-saving messages go to stderr.
         
-        # Phase 4: Run simulation with operational decisions
-        simulation_results = self._run_simulation_with_operator_decisions()
-        
-        # Phase 5: Generate comprehensive results
-        final_results = self._generate_final_results(simulation_results)
-        
-        # Save full results to Obsidian vault
-        try:
-            obsidian_notes = self.operator_interface.obsidian_saver.save_simulation_to_vault(final_results)
-            final_results['obsidian_notes'] = obsidian_notes
-        except Exception as e:
-            logger.exception("Failed to save results to Obsidian vault: %s", e)
+        A failed vault save is re-raised once the summary and the saver's
+        messages are out, so callers never report an unsaved run as saved.
+        """
+        summary_out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr if self.batch_output else summary_out):
+            sys.stdout.write(_RUN_HEADER)
+            
+            # Start operator session
+            self.operator_interface.start_session()
+            
+            # Phase 1: Get simulation overview
+            overview = self.operator_interface.get_simulation_overview_inputs()
+            self.simulation_config['overview'] = overview
+            
+            # Phase 2: Configure all facilities
+            self._configure_all_facilities()
+            
+            # Phase 3: Initialize agents with operator configurations
+            self._initialize_agents_from_config()
+            
+            # Phase 4: Run simulation with operational decisions
+            simulation_results = self._run_simulation_with_operator_decisions()
+            
+            # Phase 5: Generate comprehensive results
+            final_results = self._generate_final_results(simulation_results)
+            
+            # Save full results to Obsidian vault, once per run. The notes are written
+            # on a worker thread while the summary prints; the saver's own messages
+            # are collected meanwhile and shown after the summary, in one piece.
+            save_error = None
+            saver_output = io.StringIO()
+            with ThreadPoolExecutor(max_workers=1) as pool, contextlib.redirect_stdout(saver_output):
+                try:
+                    saver = self.operator_interface.obsidian_saver
+                    save_future = pool.submit(saver.save_simulation_to_vault, final_results)
+                except Exception as e:
+                    logger.exception("Failed to create the Obsidian saver: %s", e)
+                    save_error, save_future = e, None
+                
+                self._print_final_summary(final_results, summary_out)
+                
+                if save_future is not None:
+                    try:
+                        final_results['obsidian_notes'] = save_future.result()
+                    except Exception as e:
+                        logger.exception("Failed to save results to Obsidian vault: %s", e)
+                        save_error = e
+            
+            sys.stdout.write(_SAVING_HEADER + saver_output.getvalue())
+            if save_error is not None:
+                raise save_error
+            print(f"📁 All data saved successfully to Obsidian vault!")
         
         return final_results
     
@@ -897,7 +1165,7 @@ class EnhancedSupplyChainSimulator:
         
         print("\n✅ ALL FACILITIES CONFIGURED")
         print("Ready to start simulation with your custom supply chain!")
-        input("Press Enter to begin material flow simulation...")
+        self.operator_interface.pause("Press Enter to begin material flow simulation...")
     
     def _initialize_agents_from_config(self):
         """Initialize all agents using operator configurations"""
@@ -929,7 +1197,7 @@ class EnhancedSupplyChainSimulator:
             'recipes': {
                 f"{mining_cfg['ore_type']}_processing": {
                     'input_material': mining_cfg['ore_type'],
-                    'output_material': f"Processed_{mining_cfg['ore_type'].replace(' ', '_')}",
+                    'output_material': _processed_material_name(mining_cfg['ore_type']),
                     'conversion_ratio': processing_cfg['target_efficiency'],
                     'processing_time_hours': processing_cfg['processing_time_hours'],
                     'energy_cost_per_ton': 45.0,
@@ -942,7 +1210,7 @@ class EnhancedSupplyChainSimulator:
         
         # Manufacturing Agent
         manufacturing_cfg = self.simulation_config['manufacturing']
-        processed_material = f"Processed_{mining_cfg['ore_type'].replace(' ', '_')}"
+        processed_material = _processed_material_name(mining_cfg['ore_type'])
         
         self.agents['manufacturing'] = {
             'agent_id': 'MFG_001',
@@ -999,9 +1267,13 @@ class EnhancedSupplyChainSimulator:
     def _run_simulation_with_operator_decisions(self) -> Dict:
         """Run simulation with real-time operator decisions"""
         
+        # One wall-clock reading; stage timestamps are monotonic offsets from it
+        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
+        
         simulation_results = {
-            'simulation_id': f"SIM_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            'start_time': datetime.now(),
+            'simulation_id': f"SIM_{start_time.strftime('%Y%m%d_%H%M%S')}",
+            'start_time': start_time,
             'stages': {},
             'material_flow': [],
             'operator_decisions': [],
@@ -1012,8 +1284,7 @@ class EnhancedSupplyChainSimulator:
         ore_type = mining_cfg['ore_type']
         extraction_quantity = mining_cfg['extraction_quantity']
         
-        print(f"\n🔨 STAGE 1: MINING EXTRACTION")
-        print("=" * 40)
+        sys.stdout.write(_STAGE_MINING_HEADER)
         print(f"Extracting {extraction_quantity:,.0f} tons of {ore_type}")
         print(f"From: {mining_cfg['facility_name']}")
         
@@ -1032,154 +1303,50 @@ class EnhancedSupplyChainSimulator:
         simulation_results['stages']['mining'] = mining_result
         simulation_results['material_flow'].append({
             'stage': 'mining',
-            'timestamp': datetime.now(),
+            'timestamp': time.monotonic_ns() - start_ns,
             'material': ore_type,
             'quantity': extraction_quantity,
             'location': mining_cfg['facility_name']
         })
         
-        input("Press Enter to proceed to Processing stage...")
-        
-        # STAGE 2: PROCESSING with operator decisions
-        print(f"\n⚗️ STAGE 2: PROCESSING")
-        print("=" * 40)
-        
-        processing_request = {
-            'request_id': 'PROC_REQ_001',
-            'material_type': ore_type,
-            'quantity': extraction_quantity,
-            'operation': 'material_processing'
-        }
-        
-        processing_decisions = self.operator_interface.get_operational_decisions('processing', processing_request)
-        
-        # Process materials based on operator decisions
-        processing_result = self._execute_processing(processing_request, processing_decisions)
-        simulation_results['stages']['processing'] = processing_result
-        simulation_results['operator_decisions'].append({
-            'stage': 'processing',
-            'decisions': processing_decisions,
-            'result': processing_result
-        })
-        
-        if processing_result['status'] == 'success':
-            processed_material = processing_result['output_material']
-            processed_quantity = processing_result['output_quantity']
+        # STAGES 2-5: each stage consumes what the previous one produced
+        material, quantity = ore_type, extraction_quantity
+        for (stage, decision_stage, title, header, build_request, execute,
+             material_key, flow_label, quantity_key, name_key) in self._STAGE_PIPELINE:
+            self.operator_interface.pause(f"Press Enter to proceed to {title} stage...")
+            sys.stdout.write(header)
             
-            simulation_results['material_flow'].append({
-                'stage': 'processing',
-                'timestamp': datetime.now(),
-                'material': processed_material,
-                'quantity': processed_quantity,
-                'location': self.simulation_config['processing']['facility_name']
-            })
-        
-        input("Press Enter to proceed to Manufacturing stage...")
-        
-        # STAGE 3: MANUFACTURING with operator decisions
-        print(f"\n🏭 STAGE 3: MANUFACTURING")
-        print("=" * 40)
-        
-        manufacturing_request = {
-            'request_id': 'MFG_REQ_001',
-            'available_material': processed_material,
-            'quantity': processed_quantity,
-            'operation': 'product_manufacturing'
-        }
-        
-        manufacturing_decisions = self.operator_interface.get_operational_decisions('manufacturing', manufacturing_request)
-        
-        # Manufacturing execution
-        manufacturing_result = self._execute_manufacturing(manufacturing_request, manufacturing_decisions)
-        simulation_results['stages']['manufacturing'] = manufacturing_result
-        simulation_results['operator_decisions'].append({
-            'stage': 'manufacturing',
-            'decisions': manufacturing_decisions,
-            'result': manufacturing_result
-        })
-        
-        if manufacturing_result['status'] == 'success':
-            finished_product = manufacturing_result['product_type']
-            finished_quantity = manufacturing_result['quantity_produced']
+            request = build_request(material, quantity)
+            decisions = self.operator_interface.get_operational_decisions(decision_stage, request)
             
-            simulation_results['material_flow'].append({
-                'stage': 'manufacturing',
-                'timestamp': datetime.now(),
-                'material': finished_product,
-                'quantity': finished_quantity,
-                'location': self.simulation_config['manufacturing']['facility_name']
+            result = execute(self, request, decisions)
+            simulation_results['stages'][stage] = result
+            simulation_results['operator_decisions'].append({
+                'stage': stage,
+                'decisions': decisions,
+                'result': result
             })
-        
-        input("Press Enter to proceed to Distribution stage...")
-        
-        # STAGE 4: DISTRIBUTION with operator decisions
-        print(f"\n📦 STAGE 4: DISTRIBUTION")
-        print("=" * 40)
-        
-        distribution_request = {
-            'request_id': 'DIST_REQ_001',
-            'available_products': {finished_product: finished_quantity},
-            'operation': 'export_preparation'
-        }
-        
-        distribution_decisions = self.operator_interface.get_operational_decisions('distribution', distribution_request)
-        
-        # Distribution execution
-        distribution_result = self._execute_distribution(distribution_request, distribution_decisions)
-        simulation_results['stages']['distribution'] = distribution_result
-        simulation_results['operator_decisions'].append({
-            'stage': 'distribution',
-            'decisions': distribution_decisions,
-            'result': distribution_result
-        })
-        
-        if distribution_result['status'] == 'success':
-            export_quantity = distribution_result['export_quantity']
-            
-            simulation_results['material_flow'].append({
-                'stage': 'distribution',
-                'timestamp': datetime.now(),
-                'material': 'Export Ready Products',
-                'quantity': export_quantity,
-                'location': self.simulation_config['distribution']['center_name']
-            })
-        
-        input("Press Enter to proceed to Sales stage...")
-        
-        # STAGE 5: SALES with operator decisions
-        print(f"\n🛒 STAGE 5: SALES & CUSTOMER DELIVERY")
-        print("=" * 40)
-        
-        sales_request = {
-            'request_id': 'SALES_REQ_001',
-            'available_inventory': {finished_product: export_quantity},
-            'operation': 'customer_sales'
-        }
-        
-        sales_decisions = self.operator_interface.get_operational_decisions('retail', sales_request)
-        
-        # Sales execution
-        sales_result = self._execute_sales(sales_request, sales_decisions)
-        simulation_results['stages']['sales'] = sales_result
-        simulation_results['operator_decisions'].append({
-            'stage': 'sales',
-            'decisions': sales_decisions,
-            'result': sales_result
-        })
-        
-        if sales_result['status'] == 'success':
-            total_revenue = sales_result['total_revenue']
             
-            simulation_results['material_flow'].append({
-                'stage': 'sales',
-                'timestamp': datetime.now(),
-                'material': 'Customer Sales',
-                'quantity': sales_result['quantity_sold'],
-                'location': self.simulation_config['sales']['organization_name']
-            })
-        
-        simulation_results['end_time'] = datetime.now()
-        simulation_results['duration'] = simulation_results['end_time'] - simulation_results['start_time']
+            if result['status'] == 'success':
+                if material_key:
+                    material = result[material_key]
+                quantity = result[quantity_key]
+                
+                simulation_results['material_flow'].append({
+                    'stage': stage,
+                    'timestamp': time.monotonic_ns() - start_ns,
+                    'material': flow_label or material,
+                    'quantity': quantity,
+                    'location': self.simulation_config[stage][name_key]
+                })
+        
+        # Turn the offsets back into datetimes in one pass
+        for flow in simulation_results['material_flow']:
+            flow['timestamp'] = start_time + timedelta(microseconds=flow['timestamp'] // 1000)
+        
+        duration = timedelta(microseconds=(time.monotonic_ns() - start_ns) // 1000)
+        simulation_results['end_time'] = start_time + duration
+        simulation_results['duration'] = duration
         
         return simulation_results
     
@@ -1200,11 +1367,11 @@ class EnhancedSupplyChainSimulator:
         
         # Update agent inventories
         ore_type = request['material_type']
-        processed_material = f"Processed_{ore_type.replace(' ', '_')}"
+        processed_material = _processed_material_name(ore_type)
         
-        self.agents['processing']['raw_storage'][ore_type] = input_quantity
-        self.agents['processing']['raw_storage'][ore_type] -= batch_size
-        self.agents['processing']['processed_storage'][processed_material] = output_quantity
+        processing_agent = self.agents['processing']
+        processing_agent['raw_storage'][ore_type] = input_quantity - batch_size
+        processing_agent['processed_storage'][processed_material] = output_quantity
         
         processing_time = processing_cfg['processing_time_hours']
         energy_cost = batch_size * 45.0
@@ -1222,11 +1389,13 @@ class EnhancedSupplyChainSimulator:
             'facility_name': processing_cfg['facility_name']
         }
         
-        print(f"✅ Processing Complete:")
-        print(f"   Input: {batch_size:,.0f} tons {ore_type}")
-        print(f"   Output: {output_quantity:,.1f} tons {processed_material}")
-        print(f"   Quality: {quality_target:.2f}")
-        print(f"   Cost: ${energy_cost:,.2f}")
+        sys.stdout.write(
+            "✅ Processing Complete:\n"
+            f"   Input: {batch_size:,.0f} tons {ore_type}\n"
+            f"   Output: {output_quantity:,.1f} tons {processed_material}\n"
+            f"   Quality: {quality_target:.2f}\n"
+            f"   Cost: ${energy_cost:,.2f}\n"
+        )
         
         return result
     
@@ -1249,16 +1418,15 @@ class EnhancedSupplyChainSimulator:
         base_efficiency = manufacturing_cfg['production_efficiency']
         
         # Quality adjustments
-        quality_multipliers = {"Export Grade": 0.95, "Premium": 0.92, "Standard": 0.94, "Industrial": 0.97}
-        quality_factor = quality_multipliers.get(quality_standard, 0.94)
+        quality_factor = QUALITY_FACTORS.get(quality_standard, 0.94)
         
         actual_efficiency = base_efficiency * quality_factor
         output_quantity = production_input * actual_efficiency
         
         # Update agent inventories
-        self.agents['manufacturing']['raw_inventory'][available_material] = available_quantity
-        self.agents['manufacturing']['raw_inventory'][available_material] -= production_input
-        self.agents['manufacturing']['finished_goods'][product_type] = output_quantity
+        manufacturing_agent = self.agents['manufacturing']
+        manufacturing_agent['raw_inventory'][available_material] = available_quantity - production_input
+        manufacturing_agent['finished_goods'][product_type] = output_quantity
         
         production_time = 3.5
         energy_cost = output_quantity * 25.0
@@ -1276,11 +1444,13 @@ class EnhancedSupplyChainSimulator:
             'facility_name': manufacturing_cfg['facility_name']
         }
         
-        print(f"✅ Manufacturing Complete:")
-        print(f"   Input: {production_input:,.0f} tons {available_material}")
-        print(f"   Output: {output_quantity:,.1f} units {product_type}")
-        print(f"   Quality: {quality_standard}")
-        print(f"   Cost: ${energy_cost:,.2f}")
+        sys.stdout.write(
+            "✅ Manufacturing Complete:\n"
+            f"   Input: {production_input:,.0f} tons {available_material}\n"
+            f"   Output: {output_quantity:,.1f} units {product_type}\n"
+            f"   Quality: {quality_standard}\n"
+            f"   Cost: ${energy_cost:,.2f}\n"
+        )
         
         return result
     
@@ -1296,22 +1466,22 @@ class EnhancedSupplyChainSimulator:
         allocation_percent = decisions['allocation_percent']
         
         # Calculate export quantities
+        allocation_share = allocation_percent / 100
         total_available = sum(available_products.values())
-        export_quantity = total_available * (allocation_percent / 100)
+        export_quantity = total_available * allocation_share
         
-        # Update agent inventories
-        for product, quantity in available_products.items():
-            allocated = quantity * (allocation_percent / 100)
-            self.agents['distribution']['current_inventory'][product] = quantity - allocated
+        # Update agent inventories (what is not allocated for export stays behind)
+        self.agents['distribution']['current_inventory'].update(
+            (product, quantity - quantity * allocation_share)
+            for product, quantity in available_products.items()
+        )
         
         # Calculate shipping costs
-        shipping_cost_per_ton = {"Bulk Carrier": 25, "Container Ship": 45, "Combined Transport": 35}
-        cost_per_ton = shipping_cost_per_ton.get(shipping_method, 30)
+        cost_per_ton = SHIPPING_COST_PER_TON.get(shipping_method, 30)
         total_shipping_cost = export_quantity * cost_per_ton
         
         # Delivery time estimation
-        delivery_estimates = {"Immediate": 14, "Scheduled": 21, "Seasonal Optimal": 35, "Cost Optimal": 28}
-        delivery_days = delivery_estimates.get(decisions['delivery_schedule'], 21)
+        delivery_days = DELIVERY_DAYS.get(decisions['delivery_schedule'], 21)
         
         result = {
             'status': 'success',
@@ -1324,12 +1494,14 @@ class EnhancedSupplyChainSimulator:
             'center_name': distribution_cfg['center_name']
         }
         
-        print(f"✅ Distribution Complete:")
-        print(f"   Export to: {destination}")
-        print(f"   Quantity: {export_quantity:,.1f} tons")
-        print(f"   Method: {shipping_method}")
-        print(f"   Cost: ${total_shipping_cost:,.2f}")
-        print(f"   Delivery: {delivery_days} days")
+        sys.stdout.write(
+            "✅ Distribution Complete:\n"
+            f"   Export to: {destination}\n"
+            f"   Quantity: {export_quantity:,.1f} tons\n"
+            f"   Method: {shipping_method}\n"
+            f"   Cost: ${total_shipping_cost:,.2f}\n"
+            f"   Delivery: {delivery_days} days\n"
+        )
         
         return result
     
@@ -1348,30 +1520,25 @@ class EnhancedSupplyChainSimulator:
         total_available = sum(available_inventory.values())
         actual_sales_quantity = min(total_available, sales_quantity)
         
-        # Calculate pricing
-        base_prices = {"DAP Fertilizer": 320, "TSP Fertilizer": 285, "NPK Compound": 350}
-        
         # Get base price for first product (simplified)
-        first_product = list(available_inventory.keys())[0]
-        base_price = base_prices.get(first_product, 300)
+        first_product = next(iter(available_inventory))
+        base_price = BASE_PRICES.get(first_product, 300)
         
         # Apply pricing strategy
-        pricing_multipliers = {
-            "Market Rate": 1.0, "Competitive Price": 0.95, 
-            "Premium Price": 1.08, "Contract Price": 0.98
-        }
-        price_multiplier = pricing_multipliers.get(pricing_approach, 1.0)
+        price_multiplier = PRICE_MULTIPLIERS.get(pricing_approach, 1.0)
         final_price = base_price * price_multiplier
         
         # Calculate revenue
         total_revenue = actual_sales_quantity * final_price
         
-        # Update agent inventories
+        # Update agent inventories, drawing the sale from each product in turn
+        sales_inventory = self.agents['sales']['inventory']
+        left_to_sell = actual_sales_quantity
         for product, quantity in available_inventory.items():
-            sold_from_product = min(quantity, actual_sales_quantity)
-            self.agents['sales']['inventory'][product] = quantity - sold_from_product
-            actual_sales_quantity -= sold_from_product
-            if actual_sales_quantity <= 0:
+            sold_from_product = min(quantity, left_to_sell)
+            sales_inventory[product] = quantity - sold_from_product
+            left_to_sell -= sold_from_product
+            if left_to_sell <= 0:
                 break
         
         result = {
@@ -1380,26 +1547,64 @@ class EnhancedSupplyChainSimulator:
             'pricing_approach': pricing_approach,
             'sales_channel': decisions['sales_channel'],
             'payment_terms': decisions['payment_terms'],
-            'quantity_sold': sales_quantity,
+            'quantity_sold': actual_sales_quantity,
             'unit_price': final_price,
             'total_revenue': total_revenue,
             'organization_name': sales_cfg['organization_name']
         }
         
-        print(f"✅ Sales Complete:")
-        print(f"   Customer: {customer_type}")
-        print(f"   Quantity: {sales_quantity:,.0f} tons")
-        print(f"   Price: ${final_price:.2f}/ton")
-        print(f"   Revenue: ${total_revenue:,.2f}")
-        print(f"   Payment: {decisions['payment_terms']}")
+        sys.stdout.write(
+            "✅ Sales Complete:\n"
+            f"   Customer: {customer_type}\n"
+            f"   Quantity: {actual_sales_quantity:,.0f} tons\n"
+            f"   Price: ${final_price:.2f}/ton\n"
+            f"   Revenue: ${total_revenue:,.2f}\n"
+            f"   Payment: {decisions['payment_terms']}\n"
+        )
         
         return result
     
+    # Stages run after mining, in order: (stage, decision stage, title, header,
+    # request builder, executor, result key for the material passed on (None keeps it),
+    # material-flow label (None uses the material), result key for the quantity passed on,
+    # name field in the stage config)
+    _STAGE_PIPELINE: ClassVar[tuple] = (
+        ('processing', 'processing', 'Processing', _STAGE_PROCESSING_HEADER,
+         lambda material, quantity: {
+             'request_id': 'PROC_REQ_001',
+             'material_type': material,
+             'quantity': quantity,
+             'operation': 'material_processing'
+         },
+         _execute_processing, 'output_material', None, 'output_quantity', 'facility_name'),
+        ('manufacturing', 'manufacturing', 'Manufacturing', _STAGE_MANUFACTURING_HEADER,
+         lambda material, quantity: {
+             'request_id': 'MFG_REQ_001',
+             'available_material': material,
+             'quantity': quantity,
+             'operation': 'product_manufacturing'
+         },
+         _execute_manufacturing, 'product_type', None, 'quantity_produced', 'facility_name'),
+        ('distribution', 'distribution', 'Distribution', _STAGE_DISTRIBUTION_HEADER,
+         lambda material, quantity: {
+             'request_id': 'DIST_REQ_001',
+             'available_products': {material: quantity},
+             'operation': 'export_preparation'
+         },
+         _execute_distribution, None, 'Export Ready Products', 'export_quantity', 'center_name'),
+        ('sales', 'retail', 'Sales', _STAGE_SALES_HEADER,
+         lambda material, quantity: {
+             'request_id': 'SALES_REQ_001',
+             'available_inventory': {material: quantity},
+             'operation': 'customer_sales'
+         },
+         _execute_sales, None, 'Customer Sales', 'quantity_sold', 'organization_name'),
+    )
+    
     def _generate_final_results(self, simulation_results: Dict) -> Dict:
         """Generate comprehensive final results"""
         
-        print(f"\n📊 GENERATING FINAL RESULTS")
-        print("=" * 40)
+        sys.stdout.write(_RESULTS_HEADER)
         
         # Extract key metrics from simulation stages
         mining = simulation_results['stages'].get('mining', {})
@@ -1451,117 +1656,111 @@ class EnhancedSupplyChainSimulator:
         simulation_results['final_metrics'] = final_metrics
         simulation_results['simulation_config'] = self.simulation_config
         
-        # Print summary
-        self._print_final_summary(simulation_results)
-
-        print(f"\n💾 SAVING SIMULATION DATA TO OBSIDIAN")
-        print("=" * 40)
-
-        # Save only to Obsidian vault
-        obsidian_notes = self.operator_interface.obsidian_saver.save_simulation_to_vault(
-            simulation_results
-        )
-        simulation_results['obsidian_notes'] = obsidian_notes
-        
-        # Optional scenario saving (disabled: no local scenario manager available)
-        # Keeping UX message to indicate completion
-        print(f"📁 All data saved successfully to Obsidian vault!")
-      
         return simulation_results
     
-    def _print_final_summary(self, results: Dict):
-        """Print comprehensive simulation summary"""
-        
-        print("\n" + "=" * 80)
-        print("🏆 INTERACTIVE SUPPLY CHAIN SIMULATION COMPLETE")
-        print("=" * 80)
-        
-        overview = self.simulation_config['overview']
-        print(f"Company: {overview['company_name']}")
-        print(f"Operator: {overview['operator_name']}")
-        print(f"Simulation Type: {overview['simulation_type']}")
-        print(f"Duration: {results['duration']}")
-        print()
-        
-        print("🏗️  FACILITY CONFIGURATION:")
-        print("-" * 40)
-        print(f"Mining: {self.simulation_config['mining']['facility_name']}")
-        print(f"Processing: {self.simulation_config['processing']['facility_name']}")
-        print(f"Manufacturing: {self.simulation_config['manufacturing']['facility_name']}")
-        print(f"Distribution: {self.simulation_config['distribution']['center_name']}")
-        print(f"Sales: {self.simulation_config['sales']['organization_name']}")
-        print()
+    def _print_final_summary(self, results: Dict, out=None):
+        """Print comprehensive simulation summary to out (default: stdout)"""
+        out = out or sys.stdout
+        
+        # Batch runs writing to a file or pipe get one compact JSON line instead of the report
+        if self.batch_output:
+            out.write(json.dumps({
+                'simulation_id': results.get('simulation_id'),
+                'duration': str(results['duration']),
+                'metrics': results['final_metrics']
+            }) + "\n")
+            return
+        
+        cfg = self.simulation_config
+        overview = cfg['overview']
+        lines = [
+            "",
+            "=" * 80,
+            "🏆 INTERACTIVE SUPPLY CHAIN SIMULATION COMPLETE",
+            "=" * 80,
+            f"Company: {overview['company_name']}",
+            f"Operator: {overview['operator_name']}",
+            f"Simulation Type: {overview['simulation_type']}",
+            f"Duration: {results['duration']}",
+            "",
+            "🏗️  FACILITY CONFIGURATION:",
+            "-" * 40,
+            f"Mining: {cfg['mining']['facility_name']}",
+            f"Processing: {cfg['processing']['facility_name']}",
+            f"Manufacturing: {cfg['manufacturing']['facility_name']}",
+            f"Distribution: {cfg['distribution']['center_name']}",
+            f"Sales: {cfg['sales']['organization_name']}",
+            "",
+            "📈 MATERIAL FLOW SUMMARY:",
+            "-" * 40,
+        ]
         
-        print("📈 MATERIAL FLOW SUMMARY:")
-        print("-" * 40)
         for flow in results['material_flow']:
-            timestamp = flow['timestamp'].strftime('%H:%M:%S')
-            stage = flow['stage'].upper().ljust(12)
-            material = flow['material'].ljust(25)
-            quantity = f"{flow['quantity']:>10,.1f}"
-            print(f"{timestamp} | {stage} | {material} | {quantity}")
-        print()
-        
-        print("🎯 OPERATOR DECISIONS SUMMARY:")
-        print("-" * 40)
-        for decision in results['operator_decisions']:
-            stage = decision['stage'].upper()
-            print(f"{stage}:")
-            for key, value in decision['decisions'].items():
-                print(f"  {key}: {value}")
-            print()
+            stage = _FLOW_STAGE_LABELS.get(flow['stage']) or flow['stage'].upper().ljust(12)
+            lines.append(
+                f"{flow['timestamp']:%H:%M:%S} | {stage} | {flow['material']:<25} | {flow['quantity']:>10,.1f}"
+            )
+        lines.append("")
+        
+        lines.append("🎯 OPERATOR DECISIONS SUMMARY:")
+        lines.append("-" * 40)
+        lines.extend(
+            f"{decision['stage'].upper()}:\n"
+            + "".join(f"  {key}: {value}\n" for key, value in decision['decisions'].items())
+            for decision in results['operator_decisions']
+        )
         
-        print("💰 FINANCIAL PERFORMANCE:")
-        print("-" * 40)
         metrics = results['final_metrics']
-        print(f"Total Revenue:           ${metrics['total_revenue']:>12,.2f}")
-        print(f"Total Costs:             ${metrics['total_costs']:>12,.2f}")
-        print(f"Net Profit:              ${metrics['net_profit']:>12,.2f}")
-        print(f"Profit Margin:           {metrics['profit_margin_percent']:>12.1f}%")
-        print(f"Revenue per Ton Ore:     ${metrics['revenue_per_ton_ore']:>12.2f}")
-        print()
-        
-        print("⚡ OPERATIONAL EFFICIENCY:")
-        print("-" * 40)
-        print(f"Raw Material Input:      {metrics['input_ore_tons']:>12,.0f} tons")
-        print(f"Processed Output:        {metrics['processed_material_tons']:>12,.1f} tons")
-        print(f"Manufactured Products:   {metrics['manufactured_products_units']:>12,.1f} units")
-        print(f"Products Exported:       {metrics['exported_tons']:>12,.1f} tons")
-        print(f"Products Sold:           {metrics['sold_tons']:>12,.1f} tons")
-        print(f"Conversion Efficiency:   {metrics['ore_to_product_conversion_rate']:>12.2f}")
-        print()
+        lines += [
+            "💰 FINANCIAL PERFORMANCE:",
+            "-" * 40,
+            f"Total Revenue:           ${metrics['total_revenue']:>12,.2f}",
+            f"Total Costs:             ${metrics['total_costs']:>12,.2f}",
+            f"Net Profit:              ${metrics['net_profit']:>12,.2f}",
+            f"Profit Margin:           {metrics['profit_margin_percent']:>12.1f}%",
+            f"Revenue per Ton Ore:     ${metrics['revenue_per_ton_ore']:>12.2f}",
+            "",
+            "⚡ OPERATIONAL EFFICIENCY:",
+            "-" * 40,
+            f"Raw Material Input:      {metrics['input_ore_tons']:>12,.0f} tons",
+            f"Processed Output:        {metrics['processed_material_tons']:>12,.1f} tons",
+            f"Manufactured Products:   {metrics['manufactured_products_units']:>12,.1f} units",
+            f"Products Exported:       {metrics['exported_tons']:>12,.1f} tons",
+            f"Products Sold:           {metrics['sold_tons']:>12,.1f} tons",
+            f"Conversion Efficiency:   {metrics['ore_to_product_conversion_rate']:>12.2f}",
+            "",
+            "=" * 80,
+            "✅ Your custom supply chain simulation has been completed successfully!",
+            "📁 All decisions and results have been saved to your session log.",
+            "=" * 80,
+        ]
         
-        print("=" * 80)
-        print("✅ Your custom supply chain simulation has been completed successfully!")
-        print("📁 All decisions and results have been saved to your session log.")
-        print("=" * 80)
+        # One write for the whole report
+        out.write("\n".join(lines) + "\n")
 
-
-def main():
+def main(interactive: bool = True):
+    # Batch runs keep stdout for the simulator's JSON summary (see batch_output)
+    console = sys.stdout if interactive or sys.stdout.isatty() else sys.stderr
     try:
-        print("🏭 SUPPLY CHAIN SIMULATOR - OBSIDIAN INTEGRATION")
-        print("=" * 60)
-        print("📝 All simulation data will be saved to your Obsidian vault")
-        print("🚫 No local files will be created in the repository")
-        print()
-        
-        # Optional: Let user specify vault location
-        vault_choice = input("Use default vault location? (y/n) [y]: ").strip().lower()
-        vault_path = None
-        
-        if vault_choice in ['n', 'no']:
-            custom_path = input("Enter custom Obsidian vault path: ").strip()
-            if custom_path:
-                vault_path = custom_path
+        with contextlib.redirect_stdout(console):
+            sys.stdout.write(_MAIN_HEADER)
+            
+            # Optional: Let user specify vault location
+            vault_choice = _ask("Use default vault location? (y/n) [y]: ").strip().lower()
+            vault_path = None
+            
+            if vault_choice in ['n', 'no']:
+                custom_path = _ask("Enter custom Obsidian vault path: ").strip()
+                if custom_path:
+                    vault_path = custom_path
         
         # Create enhanced simulator with Obsidian-only mode
-        simulator = EnhancedSupplyChainSimulator(vault_path)
-        results = simulator.run_interactive_simulation()
-        simulator._print_final_summary(results)
-        print("\n✅ Saved to Obsidian vault.")
+        simulator = EnhancedSupplyChainSimulator(vault_path, interactive=interactive)
+        simulator.run_interactive_simulation()
+        print("\n✅ Saved to Obsidian vault.", file=console)
         return 0
     except Exception as e:
-        print(f"\n❌ Simulation failed: {e}")
+        print(f"\n❌ Simulation failed: {e}", file=console)
         return 1
     
 def run_demo_with_prompts():
@@ -1607,67 +1806,78 @@ def run_demo_with_prompts():
     # Save demo configuration
     interface.save_session_log("demo_configuration.json")
 
+_QUICK_START_GUIDE = (
+    "📚 SUPPLY CHAIN SIMULATOR - QUICK START GUIDE\n"
+    f"{'=' * 60}\n"
+    "\n"
+    "🎯 WHAT THIS SYSTEM DOES:\n"
+    "- Recreates your complete supply chain from raw materials to customers\n"
+    "- Asks YOU to make real operational decisions at each stage\n"
+    "- Tracks materials end-to-end through your custom supply chain\n"
+    "- Provides detailed performance and financial analysis\n"
+    "\n"
+    "🏗️  STAGES YOU'LL CONFIGURE:\n"
+    "1. Mining Facility      - Ore extraction and mining operations\n"
+    "2. Processing Plant     - Transform raw ore into processed materials\n"
+    "3. Manufacturing        - Create finished products from processed materials\n"
+    "4. Distribution Center  - Export preparation and logistics\n"
+    "5. Sales Organization   - Customer sales and delivery\n"
+    "\n"
+    "⚙️  DECISIONS YOU'LL MAKE:\n"
+    "- Facility names and locations\n"
+    "- Production capacities and rates\n"
+    "- Product types and quality standards\n"
+    "- Export destinations and shipping methods\n"
+    "- Pricing strategies and customer types\n"
+    "- Real-time operational decisions during simulation\n"
+    "\n"
+    "📊 WHAT YOU'LL GET:\n"
+    "- Complete material flow tracking\n"
+    "- Financial performance analysis\n"
+    "- Operational efficiency metrics\n"
+    "- Detailed decision audit trail\n"
+    "- Exportable results and session logs\n"
+    "\n"
+    "🚀 TO START:\n"
+    "python enhanced_supply_chain_simulator.py\n"
+    "\n"
+    "💡 TIP: Have your company details ready:\n"
+    "- Company name and locations\n"
+    "- Production targets and capacities\n"
+    "- Export destinations and customer types\n"
+    "- Current operational parameters\n"
+    "\n"
+)
+
+
 def quick_start_guide():
     """Print quick start guide for operators"""
-    
-    print("📚 SUPPLY CHAIN SIMULATOR - QUICK START GUIDE")
-    print("=" * 60)
-    print()
-    print("🎯 WHAT THIS SYSTEM DOES:")
-    print("- Recreates your complete supply chain from raw materials to customers")
-    print("- Asks YOU to make real operational decisions at each stage")
-    print("- Tracks materials end-to-end through your custom supply chain")
-    print("- Provides detailed performance and financial analysis")
-    print()
-    print("🏗️  STAGES YOU'LL CONFIGURE:")
-    print("1. Mining Facility      - Ore extraction and mining operations")
-    print("2. Processing Plant     - Transform raw ore into processed materials")
-    print("3. Manufacturing        - Create finished products from processed materials")
-    print("4. Distribution Center  - Export preparation and logistics")
-    print("5. Sales Organization   - Customer sales and delivery")
-    print()
-    print("⚙️  DECISIONS YOU'LL MAKE:")
-    print("- Facility names and locations")
-    print("- Production capacities and rates")
-    print("- Product types and quality standards")
-    print("- Export destinations and shipping methods")
-    print("- Pricing strategies and customer types")
-    print("- Real-time operational decisions during simulation")
-    print()
-    print("📊 WHAT YOU'LL GET:")
-    print("- Complete material flow tracking")
-    print("- Financial performance analysis")
-    print("- Operational efficiency metrics")
-    print("- Detailed decision audit trail")
-    print("- Exportable results and session logs")
-    print()
-    print("🚀 TO START:")
-    print("python enhanced_supply_chain_simulator.py")
-    print()
-    print("💡 TIP: Have your company details ready:")
-    print("- Company name and locations")
-    print("- Production targets and capacities")
-    print("- Export destinations and customer types")
-    print("- Current operational parameters")
-    print()
+    sys.stdout.write(_QUICK_START_GUIDE)
 
 
-if __name__ == "__main__":
+def _parse_cli(argv: Optional[Sequence[str]] = None):
+    """Command selected by the flags: --guide wins over --demo, which wins over --full (the default)"""
     import argparse
     
+    precedence = (quick_start_guide, run_demo_with_prompts, main)
     parser = argparse.ArgumentParser(description='Enhanced Interactive Supply Chain Simulator')
-    parser.add_argument('--demo', action='store_true', help='Run input prompts demo only')
-    parser.add_argument('--guide', action='store_true', help='Show quick start guide')
-    parser.add_argument('--full', action='store_true', help='Run full interactive simulation')
+    parser.add_argument('--demo', dest='commands', action='append_const', const=run_demo_with_prompts,
+                        help='Run input prompts demo only')
+    parser.add_argument('--guide', dest='commands', action='append_const', const=quick_start_guide,
+                        help='Show quick start guide')
+    parser.add_argument('--full', dest='commands', action='append_const', const=main,
+                        help='Run full interactive simulation (default)')
+    parser.add_argument('--non-interactive', action='store_true', help='Skip "Press Enter" pauses (for scripted input)')
+    parser.set_defaults(commands=[main])
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    if args.guide:
-        quick_start_guide()
-    elif args.demo:
-        run_demo_with_prompts()
-    elif args.full or len(sys.argv) == 1:
-        # Default to full simulation
-        main()
-    else:
-        print("Use --guide for instructions, --demo for input preview, or --full for complete simulation")
+    # Every flag lands in one list; the highest-precedence command runs, whatever the flag order
+    command = min(args.commands, key=precedence.index)
+    if command is main:
+        return functools.partial(main, interactive=not args.non_interactive)
+    return command
+
+
+if __name__ == "__main__":
+    _parse_cli()()
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agent modules use flat imports (from base_agent import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "agents"))
+
+from manufacturing_agent import ManufacturingAgent
+from processing_agent import ProcessingAgent
+
+
+def test_shared_specs_cannot_be_changed_through_a_request():
+    processor = ProcessingAgent("PROC_001", "Processor", 500.0, ["chemical_processing"], {
+        "Phosphorite_to_PG": {"input_material": "Phosphorite Ore", "output_material": "PG"}
+    })
+    manufacturer = ManufacturingAgent("MFG_001", "Manufacturer", 200.0, ["chemical_production"], {
+        "PG_to_Fertilizer": {"output_product": "Bagged_Fertilizer"}
+    })
+
+    processing_inputs = processor.get_required_inputs("Phosphorite Ore", 100.0)
+    manufacturing_inputs = manufacturer.get_required_inputs("PG_to_Fertilizer", 80.0)
+    for required_inputs, name in ((processing_inputs, "processing_priority"),
+                                  (manufacturing_inputs, "production_priority"),
+                                  (manufacturing_inputs, "nutrient_blend")):
+        with pytest.raises(TypeError):
+            required_inputs[name]["default"] = "urgent"
+        with pytest.raises(AttributeError):
+            required_inputs[name]["options"].append("whenever")
+
+    # The returned dict itself is per call, so callers may still add their own entries
+    processing_inputs["operator_note"] = {}
+    assert "operator_note" not in processor.get_required_inputs("Phosphorite Ore", 100.0)
+    assert processor.get_required_inputs("Phosphorite Ore", 100.0)["processing_priority"]["default"] == "normal"
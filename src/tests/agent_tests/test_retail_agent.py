@@ -0,0 +1,99 @@
+import copy
+import json
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agent modules use flat imports (from base_agent import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "agents"))
+
+from retail_agent import RetailAgent
+
+
+def make_retailer(agent_id="RETAIL_001"):
+    return RetailAgent(agent_id, "Test Store", 2000.0,
+                       ["online", "physical_store"], ["residential", "agricultural"])
+
+
+def test_required_inputs_are_read_only():
+    store_a = make_retailer("RETAIL_A")
+    store_b = make_retailer("RETAIL_B")
+    fertilizer_order = {"product_type": "Bagged_Fertilizer", "customer_zone": "agricultural"}
+    plain_order = {"product_type": "Steel_Beams", "customer_zone": "industrial"}
+
+    for order in (fertilizer_order, plain_order):
+        required_inputs = store_a.get_required_inputs(order)
+        with pytest.raises(TypeError):
+            required_inputs["pricing_strategy"]["default"] = "HACKED"
+        assert isinstance(required_inputs["pricing_strategy"]["options"], tuple)
+
+        # The returned dict itself is per call, like the other agents' inputs
+        required_inputs["operator_note"] = {}
+        assert "operator_note" not in store_a.get_required_inputs(order)
+
+    # Another store's specs are unaffected, and the agent's own lists are not exposed
+    assert store_b.get_required_inputs(plain_order)["pricing_strategy"]["default"] == "standard"
+    store_a.sales_channels.append("wholesale")
+    assert store_a.get_required_inputs(plain_order)["sales_channel"]["options"] == ("online", "physical_store")
+    assert "application_season" in store_a.get_required_inputs(fertilizer_order)
+    assert "local_delivery_options" in store_a.get_required_inputs(fertilizer_order)
+
+
+def test_retail_status_is_a_fresh_plain_report():
+    store = make_retailer()
+    store.receive_shipment_from_distribution({
+        "order_id": "ORDER_0001", "material": "Bagged_Fertilizer", "quantity": 100.0,
+        "destination": "Test Store", "delivery_zone": "Zone_A", "status": "delivered"
+    })
+
+    status = store.get_retail_status()
+    assert json.loads(json.dumps(status)) == status
+    assert pickle.loads(pickle.dumps(status)) == copy.deepcopy(status)
+
+    # Changing a report leaves the agent and later reports alone
+    status["inventory"]["by_product"]["Bagged_Fertilizer"] = 0.0
+    status["zone_analytics"]["agricultural"]["preferred_products"]["x"] = 1
+    status["connections"].append("PROC_001")
+    again = store.get_retail_status()
+    assert again["inventory"]["by_product"] == {"Bagged_Fertilizer": 100.0}
+    assert again["zone_analytics"]["agricultural"]["preferred_products"] == {}
+    assert again["connections"] == [] and store.connections == []
+
+    # Public state written directly still shows up in the next report
+    store.add_connection("DIST_001")
+    store.product_prices["Steel_Beams"] = 120.0
+    store.active_orders["ORDER_X"] = {}
+    again = store.get_retail_status()
+    assert again["connections"] == ["DIST_001"]
+    assert again["pricing"]["current_prices"]["Steel_Beams"] == 120.0
+    assert again["current_operations"]["active_orders"] == 1
+
+
+def test_order_and_customer_aggregates_follow_agent_methods():
+    store = make_retailer()
+    assert store.get_retail_status()["customer_metrics"]["total_customers"] == 0
+
+    store.update_customer_record("CUST_1", "agricultural", "returning_customer", 50.0)
+    metrics = store.get_retail_status()["customer_metrics"]
+    assert metrics["total_customers"] == 1
+    assert metrics["average_satisfaction_score"] == 4.0
+
+
+def test_inventory_total_cannot_drift_from_the_stock():
+    store = RetailAgent("RETAIL_001", "Test Store", 100.0, ["online"], ["agricultural"])
+    shipment = {"order_id": "ORDER_0001", "material": "Bagged_Fertilizer", "quantity": 100.0}
+
+    # Direct item writes would bypass the running total, so the view refuses them
+    with pytest.raises(TypeError):
+        store.product_inventory["Steel_Beams"] = 100.0
+
+    # Replacing the stock wholesale keeps the store-full check right
+    store.product_inventory = {"Steel_Beams": 100.0}
+    assert store.receive_shipment_from_distribution(shipment) is False
+
+    store.product_inventory = {"Steel_Beams": 40.0}
+    assert store.receive_shipment_from_distribution(shipment) is True
+    assert store.product_inventory == {"Steel_Beams": 40.0, "Bagged_Fertilizer": 60.0}
+    assert store.get_retail_status()["inventory"]["total_units"] == 100.0
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def client_workbook(tmp_path):
+    """Write a small client workbook (one production and one export sheet) and return its path"""
+    openpyxl = pytest.importorskip("openpyxl")
+
+    def write(path: Path = None, extra_year: bool = False) -> Path:
+        path = path or tmp_path / "client_data.xlsx"
+        years = [2022, 2023, 2024] if extra_year else [2022, 2023]
+        workbook = openpyxl.Workbook()
+
+        production = workbook.active
+        production.title = "Production"
+        production.append(["Product", *years])
+        production.append(["Phosphate Rock", *[1000.0 + 10 * i for i in range(len(years))]])
+        production.append(["DAP Fertilizer", *[400.0 + 5 * i for i in range(len(years))]])
+        production.append(["Unused Line", *[0] * len(years)])
+
+        exports = workbook.create_sheet("Exports")
+        exports.append(["TRADITIONAL PRODUCTS", None, *years])
+        exports.append(["China", None, *[None] * len(years)])
+        exports.append([None, "tons", *[None] * len(years)])
+        exports.append([None, "DAP", *[250.0 + i for i in range(len(years))]])
+        exports.append(["India", None, *[None] * len(years)])
+        exports.append([None, "TSP", *[120.0 + i for i in range(len(years))]])
+
+        workbook.create_sheet("Notes").append(["not read by the extractors"])
+        workbook.save(path)
+        return path
+
+    return write
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from src.data import data_loader
+from src.data.data_loader import SupplyChainDataLoader
+
+
+@pytest.fixture(autouse=True)
+def fresh_parse_caches():
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
+    yield
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
+
+
+def test_loaders_do_not_share_parsed_sheets(client_workbook):
+    path = client_workbook()
+    first = SupplyChainDataLoader(str(path))
+    first.load_all_sheets()
+    first.raw_data["Production"].loc[0, "Product"] = "Edited"
+    first.raw_data["Production"].iloc[0, 1] = 999
+
+    second = SupplyChainDataLoader(str(path))
+    second.load_all_sheets()
+    assert second.raw_data["Production"].loc[0, "Product"] == "Phosphate Rock"
+    second.extract_production_data()
+    assert 999 not in set(second.processed_data["production_df"]["quantity"])
+
+
+def test_workbooks_are_closed_after_loading(client_workbook, monkeypatch):
+    opened, closed = [], []
+    real_open, real_close = data_loader._open_excel, pd.ExcelFile.close
+
+    def tracking_open(path):
+        workbook = real_open(path)
+        opened.append(workbook)
+        return workbook
+
+    def tracking_close(self):
+        closed.append(self)
+        real_close(self)
+
+    monkeypatch.setattr(data_loader, "_open_excel", tracking_open)
+    monkeypatch.setattr(pd.ExcelFile, "close", tracking_close)
+
+    loader = SupplyChainDataLoader(str(client_workbook()))
+    loader.extract_production_data()
+    loader.extract_export_data()
+
+    assert opened
+    assert {id(workbook) for workbook in opened} == {id(workbook) for workbook in closed}
@@ -0,0 +1,82 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.data import data_loader
+from src.data.data_loader import SupplyChainDataLoader, _sidecar_path
+
+
+@pytest.fixture(autouse=True)
+def fresh_parse_caches():
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
+    yield
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
+
+
+def load(path):
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
+    loader = SupplyChainDataLoader(str(path))
+    loader.extract_production_data()
+    loader.extract_export_data()
+    return loader
+
+
+def sidecar_for(path, sheet_name):
+    stat = path.stat()
+    return _sidecar_path(path.resolve(), stat.st_mtime_ns, stat.st_size, sheet_name)
+
+
+def test_sidecar_directory_is_per_workbook_file(tmp_path):
+    xlsx = _sidecar_path(tmp_path / "data.xlsx", 1, 2, "Production")
+    xls = _sidecar_path(tmp_path / "data.xls", 1, 2, "Production")
+    assert xlsx.parent.parent.name == "data.xlsx.cache"
+    assert xlsx != xls
+
+
+def test_unreadable_sidecar_falls_back_to_excel(client_workbook):
+    path = client_workbook()
+    expected = load(path).processed_data['production_df']
+    sidecar = sidecar_for(path, "Production")
+    assert sidecar.exists()
+
+    sidecar.write_bytes(b"PAR1 truncated")
+    reloaded = load(path).processed_data['production_df']
+
+    pd.testing.assert_frame_equal(reloaded, expected)
+    # The broken sidecar was replaced by a readable one
+    pd.read_parquet(sidecar)
+    assert not list(sidecar.parent.glob("*.tmp"))
+
+
+def test_restored_workbook_is_not_served_from_a_newer_sidecar(client_workbook):
+    path = client_workbook(extra_year=True)
+    assert 2024 in set(load(path).processed_data['production_df']['year'])
+
+    # Restore an older copy with an older timestamp than the cached sheets
+    original_mtime_ns = path.stat().st_mtime_ns
+    client_workbook(path)
+    os.utime(path, ns=(original_mtime_ns - 10**9, original_mtime_ns - 10**9))
+
+    assert 2024 not in set(load(path).processed_data['production_df']['year'])
+    # Only the current workbook version keeps a cache directory
+    assert [d.name for d in sidecar_for(path, "Production").parent.parent.iterdir()] == \
+        [sidecar_for(path, "Production").parent.name]
+
+
+def test_cache_write_failure_is_not_fatal(client_workbook, monkeypatch):
+    path = client_workbook()
+
+    def read_only_dir(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(data_loader.tempfile, "mkstemp", read_only_dir)
+    loader = load(path)
+
+    assert len(loader.processed_data['production_df']) == 4
+    assert not sidecar_for(path, "Production").exists()
@@ -0,0 +1,56 @@
+"""
+Regression guard for the Excel fast paths: every reader and the Parquet
+sheet cache must produce exactly the same extracted frames.
+"""
+import pandas as pd
+import pytest
+
+from src.data import data_loader
+from src.data.data_loader import SupplyChainDataLoader
+
+
+def extract(path, engine, parquet_cache, monkeypatch):
+    monkeypatch.setattr(data_loader, "_EXCEL_ENGINE", engine)
+    monkeypatch.setattr(data_loader, "PARQUET_CACHE_AVAILABLE", parquet_cache)
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
+
+    loader = SupplyChainDataLoader(str(path))
+    loader.extract_production_data()
+    loader.extract_export_data()
+    return loader.processed_data['production_df'], loader.processed_data['exports_df']
+
+
+def assert_same_frames(actual, expected):
+    for actual_df, expected_df in zip(actual, expected):
+        pd.testing.assert_frame_equal(actual_df, expected_df)
+
+
+def test_readers_and_sheet_cache_extract_identical_frames(client_workbook, monkeypatch):
+    path = client_workbook()
+    production_df, exports_df = expected = extract(path, "openpyxl", False, monkeypatch)
+
+    # Sanity-check the baseline itself
+    assert list(production_df.columns) == data_loader.PRODUCTION_COLUMNS
+    assert list(exports_df.columns) == data_loader.EXPORT_COLUMNS
+    assert len(production_df) == 4
+    assert exports_df[['country', 'product']].drop_duplicates().values.tolist() == [['China', 'DAP'], ['India', 'TSP']]
+
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        assert_same_frames(extract(path, "calamine", False, monkeypatch), expected)
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return
+    # First load writes the Parquet sidecars, the second reads them back
+    assert_same_frames(extract(path, "openpyxl", True, monkeypatch), expected)
+    assert sorted(p.name for p in path.with_name(path.name + ".cache").rglob("*.parquet")) == \
+        ["Exports.parquet", "Production.parquet"]
+    assert_same_frames(extract(path, "openpyxl", True, monkeypatch), expected)
+    data_loader._cached_sheet.cache_clear()
+    data_loader._cached_sheet_names.cache_clear()
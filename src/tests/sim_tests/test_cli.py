@@ -0,0 +1,32 @@
+import functools
+
+import pytest
+
+from src.simulation import main_sim
+
+
+@pytest.mark.parametrize("argv, command", [
+    ([], "main"),
+    (["--full"], "main"),
+    (["--guide"], main_sim.quick_start_guide),
+    (["--demo"], main_sim.run_demo_with_prompts),
+    (["--guide", "--demo"], main_sim.quick_start_guide),
+    (["--demo", "--guide"], main_sim.quick_start_guide),
+    (["--full", "--demo"], main_sim.run_demo_with_prompts),
+    (["--demo", "--full"], main_sim.run_demo_with_prompts),
+    (["--full", "--guide", "--full"], main_sim.quick_start_guide),
+])
+def test_cli_flag_precedence(argv, command):
+    selected = main_sim._parse_cli(argv)
+    if command == "main":
+        assert isinstance(selected, functools.partial) and selected.func is main_sim.main
+        assert selected.keywords == {"interactive": True}
+    else:
+        assert selected is command
+
+
+def test_cli_non_interactive_flag():
+    selected = main_sim._parse_cli(["--non-interactive"])
+    assert selected.func is main_sim.main
+    assert selected.keywords == {"interactive": False}
+    assert main_sim._parse_cli(["--non-interactive", "--demo"]) is main_sim.run_demo_with_prompts
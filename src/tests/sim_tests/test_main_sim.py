@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from src.simulation import main_sim
+
+
+def scripted_answer(prompt: str = "") -> str:
+    """Accept every default, picking the first option wherever a choice is required"""
+    if "Enter choice" in prompt or "Enter method numbers" in prompt or "country numbers" in prompt:
+        return "1"
+    return ""
+
+
+class PrintingSaver:
+    """Stands in for the Obsidian saver, chatting on stdout the way the real one does"""
+    vault_path = "vault"
+
+    def save_simulation_to_vault(self, results):
+        for note in range(20):
+            print(f"📝 saved note {note}")
+        return {"notes": 20}
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    monkeypatch.setattr(main_sim, "_ask", scripted_answer)
+
+    def build(interactive: bool):
+        sim = main_sim.EnhancedSupplyChainSimulator(interactive=interactive)
+        sim.operator_interface.obsidian_saver = PrintingSaver()
+        return sim
+
+    return build
+
+
+def test_batch_run_writes_only_the_json_summary_to_stdout(simulator, capsys):
+    results = simulator(interactive=False).run_interactive_simulation()
+
+    out, err = capsys.readouterr()
+    summary = json.loads(out)
+    assert out.count("\n") == 1
+    assert summary["metrics"] == results["final_metrics"]
+    assert results["obsidian_notes"] == {"notes": 20}
+    # Progress and the saver's chatter are still there, on stderr
+    assert "📝 saved note 19" in err
+    assert "✅ Processing Complete" in err
+
+
+def test_saver_messages_follow_the_summary_in_one_block(simulator, capsys):
+    simulator(interactive=True).run_interactive_simulation()
+
+    out = capsys.readouterr().out
+    summary_end = out.index("🏆 INTERACTIVE SUPPLY CHAIN SIMULATION COMPLETE")
+    summary_end = out.index("=" * 80 + "\n", out.index("⚡ OPERATIONAL EFFICIENCY:", summary_end))
+    saving = out.index("💾 SAVING SIMULATION DATA TO OBSIDIAN")
+    notes = [out.index(f"📝 saved note {note}\n") for note in range(20)]
+    assert summary_end < saving < notes[0]
+    assert notes == sorted(notes)
+    assert out.index("📁 All data saved successfully") > notes[-1]
+
+
+@pytest.mark.parametrize("requested, sold, left", [
+    (70.0, 70.0, {"DAP": 0.0, "TSP": 20.0}),
+    (500.0, 90.0, {"DAP": 0.0, "TSP": 0.0}),
+])
+def test_sales_report_the_quantity_actually_sold(requested, sold, left, capsys):
+    sim = main_sim.EnhancedSupplyChainSimulator(interactive=False)
+    sim.simulation_config['sales'] = {'organization_name': 'Test Sales'}
+    sim.agents['sales'] = {'inventory': {}}
+
+    result = sim._execute_sales({'available_inventory': {"DAP": 60.0, "TSP": 30.0}}, {
+        'customer_type': 'Domestic Distributor', 'pricing_approach': 'Market Price',
+        'sales_quantity': requested, 'sales_channel': 'Direct Sales', 'payment_terms': 'Net 30'
+    })
+
+    assert result['quantity_sold'] == sold
+    assert result['total_revenue'] == pytest.approx(sold * result['unit_price'])
+    assert sim.agents['sales']['inventory'] == left
+    assert f"Quantity: {sold:,.0f} tons" in capsys.readouterr().out
+
+
+class FailingSaver(PrintingSaver):
+    def save_simulation_to_vault(self, results):
+        print("📝 saved note 0")
+        raise OSError("vault is read-only")
+
+
+def test_failed_vault_save_is_not_reported_as_saved(simulator, monkeypatch, capsys):
+    sim = simulator(interactive=True)
+    sim.operator_interface.obsidian_saver = FailingSaver()
+    with pytest.raises(OSError, match="vault is read-only"):
+        sim.run_interactive_simulation()
+    out = capsys.readouterr().out
+    assert "📝 saved note 0" in out
+    assert "📁 All data saved successfully" not in out
+
+    # main() reports the failure instead of claiming the run was saved
+    monkeypatch.setattr(main_sim, "EnhancedSupplyChainSimulator", lambda *args, **kwargs: sim)
+    assert main_sim.main() == 1
+    out = capsys.readouterr().out
+    assert "❌ Simulation failed: vault is read-only" in out
+    assert "✅ Saved to Obsidian vault." not in out
+
+
+def test_missing_saver_fails_before_any_prompt(monkeypatch):
+    def missing():
+        raise ImportError("Could not import ObsidianAutoSaver. Ensure obsidian_auto_saver.py exists.")
+
+    def no_prompts(prompt=""):
+        raise AssertionError("prompted before the saver was checked")
+
+    monkeypatch.setattr(main_sim, "_load_obsidian_saver_cls", missing)
+    monkeypatch.setattr(main_sim, "_ask", no_prompts)
+    with pytest.raises(ImportError, match="obsidian_auto_saver.py"):
+        main_sim.EnhancedSupplyChainSimulator(interactive=False)
@@ -0,0 +1,106 @@
+import pytest
+
+from src.simulation import main_sim
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Feed scripted operator answers to _ask; each script returns the prompts it was shown"""
+    def script(*lines):
+        prompts = []
+        remaining = iter(lines)
+
+        def ask(prompt=""):
+            prompts.append(prompt)
+            return next(remaining)
+
+        monkeypatch.setattr(main_sim, "_ask", ask)
+        return prompts
+
+    return script
+
+
+@pytest.fixture
+def interface():
+    return main_sim.InteractiveOperatorInterface(interactive=False)
+
+
+@pytest.mark.parametrize("lines, expected", [
+    (("",), ["A", "B", "C"]),
+    (("all",), ["A", "B", "C"]),
+    (("NONE",), []),
+    (("3,1",), ["A", "C"]),
+    (("1,1",), ["A"]),
+    (("1 2", "2"), ["B"]),      # malformed, asked again
+    (("4", "2"), ["B"]),        # out of range, asked again
+    (("0,1", "1"), ["A"]),      # 0 is not a menu number
+])
+def test_multi_toggle(interface, answers, lines, expected):
+    prompts = answers(*lines)
+    assert interface._multi_toggle("Pick", ["A", "B", "C"]) == expected
+    assert len(prompts) == len(lines)
+
+
+def test_multi_toggle_reports_out_of_range_numbers(interface, answers, capsys):
+    answers("2,5", "2")
+    interface._multi_toggle("Pick", ["A", "B", "C"], default_all=False)
+    assert "❌ Please enter numbers between 1 and 3" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1", [0]),
+    ("1,3", [0, 2]),
+    (" 2 , 4,1 ", [1, 3, 0]),
+    ("", None),
+    ("1,", None),
+    ("a,b", None),
+    ("1;2", None),
+    ("-1", None),
+])
+def test_parse_csv_indices(text, expected):
+    assert main_sim._parse_csv_indices(text) == expected
+
+
+def test_choice_index_accepts_numbers_and_names():
+    index = main_sim._choice_index(("Spot Market", "Long-term Contract"))
+    assert index["1"] == "Spot Market"
+    assert index["2"] == "Long-term Contract"
+    assert index["spot market"] == "Spot Market"
+    assert "3" not in index
+
+
+def test_get_choice_retries_until_valid(interface, answers):
+    prompts = answers("4", "x", "2")
+    assert interface._get_choice("Pick", ["A", "B", "C"]) == "B"
+    assert len(prompts) == 3
+
+    answers("")
+    assert interface._get_choice("Pick", ["A", "B", "C"], default="C") == "C"
+    answers("b")
+    assert interface._get_choice("Pick", ["A", "B", "C"]) == "B"
+
+
+def test_range_error():
+    assert main_sim._range_error(5, 1, 10) is None
+    assert main_sim._range_error(0, 1, 10) == "❌ Value must be at least 1"
+    assert main_sim._range_error(11, None, 10) == "❌ Value must be at most 10"
+
+
+def test_get_float_input_retries_until_in_range(interface, answers):
+    prompts = answers("")
+    assert interface._get_float_input("Qty", 1, 10, default=5) == 5
+    assert prompts == ["Qty (1-10) [default: 5]: "]
+
+    prompts = answers("abc", "20", "7.5")
+    assert interface._get_float_input("Qty", 1, 10) == 7.5
+    assert len(prompts) == 3
+
+
+def test_clamp_mode(interface, answers):
+    assert main_sim._clamp(0, 1, 10) == 1
+    assert main_sim._clamp(11, 1, 10) == 10
+    assert main_sim._clamp(-5, None, None) == -5
+
+    prompts = answers("20")
+    assert interface._get_float_input("Qty", 1, 10, clamp=True) == 10
+    assert len(prompts) == 1